@@ -1,9 +1,10 @@
 from PySide6.QtCore import QThread, Signal
 
-
-class ThreadCancelled(Exception):
-    def __str__(self):
-        return "Some QThread was cancelled."
+from util.progress import (
+    ThreadCancelled,
+    set_progress_callbacks,
+    set_verify_callbacks,
+)
 
 
 class RandomizationThread(QThread):
@@ -15,17 +16,29 @@ class RandomizationThread(QThread):
     randomization_complete = Signal()
 
     cancelled = False
-    callback = None
 
     def __init__(self):
         QThread.__init__(self)
 
+    def check_cancelled(self):
+        if RandomizationThread.cancelled:
+            RandomizationThread.cancelled = False
+            raise ThreadCancelled
+
+    def update_value(self, value: int):
+        self.check_cancelled()
+        self.dialog_value_update.emit(value)
+
+    def update_text(self, label_text: str):
+        self.check_cancelled()
+        self.dialog_label_update.emit(label_text)
+
     def run(self):
         try:
             # Import here to prevent circular dependency
             from randomizer.randomize import randomize
 
-            RandomizationThread.callback = self
+            set_progress_callbacks(self.update_value, self.update_text)
             randomize()
         except Exception as e:
             import traceback
@@ -41,7 +54,7 @@ class RandomizationThread(QThread):
 
         self.randomization_complete.emit()
 
-        RandomizationThread.callback = None
+        set_progress_callbacks()
 
 
 class VerificationThread(QThread):
@@ -53,7 +66,6 @@ class VerificationThread(QThread):
     verification_complete = Signal()
 
     cancelled = False
-    callback = None
 
     def __init__(self, verify_all: bool = False):
         QThread.__init__(self)
@@ -62,12 +74,25 @@ class VerificationThread(QThread):
     def set_verify_all(self, should_verify_all: bool):
         self.verify_all = should_verify_all
 
+    def check_cancelled(self):
+        if VerificationThread.cancelled:
+            VerificationThread.cancelled = False
+            raise ThreadCancelled
+
+    def update_value(self, value: int):
+        self.check_cancelled()
+        self.dialog_value_update.emit(value)
+
+    def update_text(self, label_text: str):
+        self.check_cancelled()
+        self.dialog_label_update.emit(label_text)
+
     def run(self):
         try:
             # Import here to prevent circular dependency
             from randomizer.verify_extract import verify_extract
 
-            VerificationThread.callback = self
+            set_verify_callbacks(self.update_value, self.update_text)
             verify_extract(verify_all_files=self.verify_all)
         except Exception as e:
             import traceback
@@ -76,4 +101,4 @@ class VerificationThread(QThread):
 
         self.verification_complete.emit()
 
-        VerificationThread.callback = None
+        set_verify_callbacks()
@@ -22,7 +22,7 @@ from filepathconstants import (
 
 from gui.accessibility import Accessibility
 from gui.advanced import Advanced
-from gui.dialogs.dialog_header import print_progress_text
+from util.progress import print_progress_text
 from gui.tracker import Tracker
 from gui.dialogs.error_dialog import error, error_from_str
 from gui.dialogs.fi_info_dialog import FiInfoDialog
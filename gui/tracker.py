@@ -1265,6 +1265,7 @@ class Tracker:
 
         change_connections(entrance, target)
         self.connected_entrances[entrance] = target
+        self.clear_entrance_hint_regions(entrance)
 
         # Update everything after making a connection
         self.update_areas_locations()
@@ -1274,6 +1275,7 @@ class Tracker:
 
     def tracker_disconnect_entrance(self, entrance: Entrance) -> None:
         if target := self.connected_entrances.get(entrance, None):
+            self.clear_entrance_hint_regions(entrance)
             restore_connections(entrance, target)
             del self.connected_entrances[entrance]
             self.update_areas_locations()
@@ -1281,6 +1283,13 @@ class Tracker:
             self.update_tracker()
             self.calculate_own_dungeon_key_locations()
 
+    # The areas an entrance leads to might get their hint regions through it,
+    # so clear them to be assigned again with the entrance's new connection
+    def clear_entrance_hint_regions(self, entrance: Entrance) -> None:
+        clear_searched_hint_regions(entrance.connected_area)
+        if entrance.reverse and not entrance.decoupled:
+            clear_searched_hint_regions(entrance.replaces.reverse.connected_area)
+
     def on_start_new_tracker_button_clicked(self) -> None:
         confirm_choice = self.main.fi_question_dialog.show_dialog(
             "Start New Tracker",
@@ -1537,7 +1546,7 @@ class Tracker:
         small_keys: bool = self.world.setting("small_keys") == "own_dungeon"
         boss_keys: bool = self.world.setting("boss_keys") == "own_dungeon"
 
-        item_pool = get_complete_item_pool([self.world])
+        item_pool = list(get_complete_item_pool([self.world]).elements())
         # Filter out keys from the item pool
         # Small Keys must be first
         own_dungeon_keys = [
@@ -2,7 +2,8 @@ from logic.location import *
 from logic.entrance import *
 from logic.requirements import TOD
 
-from typing import TYPE_CHECKING
+from collections import deque
+from typing import TYPE_CHECKING, Iterable
 import logging
 import random
 
@@ -38,6 +39,9 @@ class Area:
         self.id: int = None
         self.name: str = None
         self.hint_regions: set[str] = set()
+        # Whether hint_regions was found by searching the world graph instead
+        # of coming from the world data
+        self.searched_hint_regions: bool = False
         self.events: list[EventAccess] = []
         self.locations: list[LocationAccess] = []
         self.exits: list[Entrance] = []
@@ -62,12 +66,11 @@ class Area:
             return self.hint_regions
 
         hint_regions: set[str] = set()
-        already_checked: set["Area"] = set()
-        area_queue: list["Area"] = [self]
+        already_checked: set["Area"] = {self}
+        area_queue: deque["Area"] = deque([self])
 
         while len(area_queue) > 0:
-            area = area_queue.pop(0)
-            already_checked.add(area)
+            area = area_queue.popleft()
 
             if len(area.hint_regions) > 0:
                 for region in area.hint_regions:
@@ -81,6 +84,7 @@ class Area:
             # as long as they haven't been checked yet
             for entrance in area.entrances:
                 if entrance.parent_area not in already_checked:
+                    already_checked.add(entrance.parent_area)
                     area_queue.append(entrance.parent_area)
 
         return hint_regions
@@ -126,16 +130,15 @@ class Area:
 # assigned hint region. General hint regions will have priority
 # over dungeons. I.e. If an area is connected to a general
 # hint region and a dungeon it will only be assigned to the
-# general hint region.
-def assign_hint_regions_and_dungeon_locations(starting_area: Area):
+# general hint region. Returns all the areas which were checked.
+def assign_hint_regions_and_dungeon_locations(starting_area: Area) -> set[Area]:
     hint_regions: set[str] = set()
-    already_checked: set[Area] = set()
-    unassigned_areas: set[Area] = set()
-    area_queue: list[Area] = [starting_area]
+    already_checked: set[Area] = {starting_area}
+    unassigned_areas: list[Area] = []
+    area_queue: deque[Area] = deque([starting_area])
 
     while len(area_queue) > 0:
-        area = area_queue.pop(0)
-        already_checked.add(area)
+        area = area_queue.popleft()
 
         if len(area.hint_regions) > 0 or area.name == "Root":
             for region in area.hint_regions:
@@ -144,12 +147,13 @@ def assign_hint_regions_and_dungeon_locations(starting_area: Area):
                     hint_regions.add(region)
             continue
 
-        unassigned_areas.add(area)
+        unassigned_areas.append(area)
         # If this area isn't assigned any hint regions
         # add its entrances' parent areas to the queue
         # as long as they haven't been checked yet
         for entrance in area.entrances:
             if entrance.parent_area not in already_checked:
+                already_checked.add(entrance.parent_area)
                 area_queue.append(entrance.parent_area)
 
     # Filter out dungeon regions if there are any general hint regions
@@ -164,6 +168,7 @@ def assign_hint_regions_and_dungeon_locations(starting_area: Area):
     # Assign the found hint regions to all unassigned areas
     for area in unassigned_areas:
         area.hint_regions = hint_regions
+        area.searched_hint_regions = True
         logging.getLogger("").debug(
             f"{area} has been assigned hint region(s): {hint_regions}"
         )
@@ -187,3 +192,49 @@ def assign_hint_regions_and_dungeon_locations(starting_area: Area):
                     else:
                         if random.randint(0, 1):
                             dungeon.goal_location = goal_location
+
+    return already_checked
+
+
+# Assigns hint regions to every area which doesn't have any yet in a single
+# pass over the world graph. Areas checked while searching from an earlier
+# area already have their final hint regions (or none can be found for them),
+# so they're never searched from again.
+def assign_all_hint_regions_and_dungeon_locations(areas: Iterable[Area]) -> None:
+    already_checked: set[Area] = set()
+    for area in areas:
+        if area not in already_checked:
+            already_checked |= assign_hint_regions_and_dungeon_locations(area)
+
+
+# Clears the searched hint regions of the given area and every area
+# whose hint regions could've been found through it, so they can be
+# assigned again after the entrances leading to the area change. Areas
+# with hint regions from the world data are left as they are.
+def clear_searched_hint_regions(starting_area: Area) -> None:
+    already_checked: set[Area] = {starting_area}
+    area_queue: deque[Area] = deque([starting_area])
+
+    while len(area_queue) > 0:
+        area = area_queue.popleft()
+        if not area.searched_hint_regions:
+            continue
+
+        # Also take the area's locations back out of any dungeon
+        for region in area.hint_regions:
+            if region in area.world.dungeons:
+                dungeon = area.world.get_dungeon(region)
+                area_locations = [la.location for la in area.locations]
+                dungeon.locations = [
+                    loc for loc in dungeon.locations if loc not in area_locations
+                ]
+        area.hint_regions = set()
+        area.searched_hint_regions = False
+
+        for exit_ in area.exits:
+            if (
+                exit_.connected_area is not None
+                and exit_.connected_area not in already_checked
+            ):
+                already_checked.add(exit_.connected_area)
+                area_queue.append(exit_.connected_area)
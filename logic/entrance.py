@@ -102,8 +102,11 @@ class Entrance:
         self.connected_area.entrances.remove(self)
         previously_connected = self.connected_area
         self.connected_area = None
-        for entrance in self.conditional_vanilla_connections:
-            entrance.disconnect()
+        # Conditional connections are only made when connecting to the
+        # original area, so only undo them when leaving it
+        if previously_connected == self.original_connected_area:
+            for entrance in self.conditional_vanilla_connections:
+                entrance.disconnect()
         return previously_connected
 
     def bind_two_way(self, return_entrance: "Entrance") -> None:
@@ -5,26 +5,109 @@ from .item import Item
 from .item_pool import get_complete_item_pool
 from .world import World
 from .search import Search, SearchMode, all_logic_satisfied
+from .parallel import can_fork_workers, run_speculative_attempts
+from .profiler import profile_count, RETRIES
 from collections import Counter, OrderedDict
 
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
+import multiprocessing as mp
 import yaml
 import logging
 import random
+import time
 
 if TYPE_CHECKING:
+    from .area import Area
     from .world import World
 
 EntrancePool = list[Entrance]
 EntrancePools = OrderedDict[str, list[Entrance]]
 
 
-class EntranceShuffleError(RuntimeError):
-    pass
+# Reasons a candidate connection can be rejected for
+SELF_CONNECTION: str = "self-connection"
+UNREACHABLE_LOCATIONS: str = "unreachable locations"
+LOGIC_UNSATISFIED: str = "logic unsatisfied"
+NO_SPHERE_ZERO_LOCATIONS: str = "no sphere-zero locations"
+OTHER: str = "other"
 
 
-def shuffle_world_entrances(world: World, worlds: list[World]):
+class EntranceShuffleError(RuntimeError):
+    def __init__(self, message: str = "", reason: str = OTHER) -> None:
+        super().__init__(message)
+        self.reason: str = reason
+
+    # Keep the reason when sent back from worker processes
+    def __reduce__(self):
+        return (EntranceShuffleError, (str(self), self.reason))
+
+
+# Counters for how the entrances of a single pool were shuffled
+class EntrancePoolStats:
+    def __init__(self) -> None:
+        # Candidate connections which were validated
+        self.attempts: int = 0
+        # Candidate connections which failed validation, by reason
+        self.rejections: Counter[str] = Counter()
+        # Time spent validating candidate connections, in seconds
+        self.validation_time: float = 0.0
+        # Times the whole pool had to be shuffled again
+        self.retries: int = 0
+
+    def add(self, other: "EntrancePoolStats") -> None:
+        self.attempts += other.attempts
+        self.rejections += other.rejections
+        self.validation_time += other.validation_time
+        self.retries += other.retries
+
+    def to_dict(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "rejections": dict(sorted(self.rejections.items())),
+            "validation_time": round(self.validation_time, 6),
+            "retries": self.retries,
+        }
+
+
+# Entrance shuffle stats for a world, by the type of pool. Non-assumed pools
+# are shuffled together and share a single entry.
+class EntranceShuffleStats:
+    NON_ASSUMED: str = "Non-Assumed"
+
+    def __init__(self) -> None:
+        self.pools: dict[str, EntrancePoolStats] = {}
+
+    def pool(self, entrance_type: str) -> EntrancePoolStats:
+        return self.pools.setdefault(entrance_type, EntrancePoolStats())
+
+    def total(self) -> EntrancePoolStats:
+        total = EntrancePoolStats()
+        for pool_stats in self.pools.values():
+            total.add(pool_stats)
+        return total
+
+    def to_dict(self) -> dict:
+        return {
+            entrance_type: pool_stats.to_dict()
+            for entrance_type, pool_stats in self.pools.items()
+        }
+
+
+# What's known about the worlds while shuffle_entrances connects entrances one
+# at a time. Every connection only adds access, except for the assumed access
+# to the area(s) it now leads to, so once logic is known to be satisfied, later
+# connections only need to check that those areas are still fully reachable.
+class EntranceValidation:
+    def __init__(self) -> None:
+        self.logic_satisfied: bool = False
+        self.sphere_zero_locations_reachable: bool = False
+
+
+def shuffle_world_entrances(
+    world: World, worlds: list[World], workers: int = 0, candidate_workers: int = 0
+) -> EntranceShuffleStats:
+    stats = EntranceShuffleStats()
     set_all_entrances_data(world)
 
     entrance_pools = create_entrance_pools(world)
@@ -35,13 +118,25 @@ def shuffle_world_entrances(world: World, worlds: list[World]):
 
     # Then shuffle entrance pools with non-assumed target pools
     shuffle_non_assumed_entrance_pools(
-        world, worlds, entrance_pools, target_entrance_pools
+        world,
+        worlds,
+        entrance_pools,
+        target_entrance_pools,
+        stats.pool(EntranceShuffleStats.NON_ASSUMED),
     )
 
     # Then shuffle the rest of the entrances
+    graph = StructuralGraph(world)
     for entrance_type, entrance_pool in entrance_pools.items():
         shuffle_entrance_pool(
-            world, worlds, entrance_pool, target_entrance_pools[entrance_type]
+            world,
+            worlds,
+            entrance_pool,
+            target_entrance_pools[entrance_type],
+            graph,
+            stats.pool(entrance_type),
+            workers=workers,
+            candidate_workers=candidate_workers,
         )
 
     # Unset goal locations that aren't reachable so they can't be chosen
@@ -57,15 +152,26 @@ def shuffle_world_entrances(world: World, worlds: list[World]):
                     f"Removing {location} as goal location due to it being unreachable"
                 )
 
+    return stats
 
-def set_all_entrances_data(world: World) -> None:
-    with open(ENTRANCE_SHUFFLE_DATA_PATH, encoding="utf-8") as entrance_data_file:
-        entrance_shuffle_list = yaml.safe_load(entrance_data_file)
+
+# The parsed entrance shuffle data along with the indexes derived from it.
+# None of this depends on the world, so it's only loaded once per process.
+class EntranceShuffleData:
+    def __init__(self, entrance_data_list: list[dict]) -> None:
+        self.entrance_data_list: list[dict] = entrance_data_list
+        # Names of the entrances of each type in the order they're listed in
+        self.entrance_names_by_type: dict[str, list[str]] = {}
+        self.primary_entrance_names_by_type: dict[str, list[str]] = {}
+        # (main door, coupled door) name pairs for each set of double doors and
+        # the names of the coupled doors, which are removed when coupling them
+        self.coupled_doors: list[tuple[str, str]] = []
+        self.coupled_door_names: set[str] = set()
 
         # Keep track of which double door entrances are together
-        coupled_doors: dict[str, list[Entrance]] = {}
+        door_couple_tags: dict[str, list[tuple[str, bool]]] = {}
 
-        for entrance_data in entrance_shuffle_list:
+        for entrance_data in entrance_data_list:
             # Check that all required fields exist
             for field in ["type", "forward"]:
                 if field not in entrance_data:
@@ -86,106 +192,149 @@ def set_all_entrances_data(world: World) -> None:
                     )
 
             entrance_type = entrance_data["type"]
-            forward_entrance = world.get_entrance(
-                entrance_data["forward"]["connection"]
-            )
-            return_entrance = (
-                world.get_entrance(entrance_data["return"]["connection"])
-                if "return" in entrance_data
-                else None
+            forward_name = entrance_data["forward"]["connection"]
+            names = self.entrance_names_by_type.setdefault(entrance_type, [])
+            names.append(forward_name)
+            self.primary_entrance_names_by_type.setdefault(entrance_type, []).append(
+                forward_name
             )
+            if "return" in entrance_data:
+                names.append(entrance_data["return"]["connection"])
 
             # Add double door entrances to their respective tag group
             if "door_couple_tag" in entrance_data:
-                tag = entrance_data["door_couple_tag"]
-                if tag not in coupled_doors:
-                    coupled_doors[tag] = []
-                coupled_doors[tag].extend([forward_entrance, return_entrance])
-
-            forward_entrance.type = entrance_type
-            forward_entrance.original_type = entrance_type
-            forward_entrance.exit_infos = entrance_data["forward"].get(
-                "exit_infos", None
+                doors = door_couple_tags.setdefault(
+                    entrance_data["door_couple_tag"], []
+                )
+                doors.append((forward_name, True))
+                doors.append((entrance_data["return"]["connection"], False))
+
+        # Pair each door with the other door going the same direction
+        for doors in door_couple_tags.values():
+            while doors:
+                main_door, primary = doors.pop()
+                coupled_door = next(door for door in doors if door[1] == primary)
+                doors.remove(coupled_door)
+                self.coupled_doors.append((main_door, coupled_door[0]))
+                self.coupled_door_names.add(coupled_door[0])
+
+
+_entrance_shuffle_data: EntranceShuffleData | None = None
+
+
+def get_entrance_shuffle_data() -> EntranceShuffleData:
+    global _entrance_shuffle_data
+    if _entrance_shuffle_data is None:
+        with open(ENTRANCE_SHUFFLE_DATA_PATH, encoding="utf-8") as entrance_data_file:
+            _entrance_shuffle_data = EntranceShuffleData(
+                yaml.safe_load(entrance_data_file)
             )
-            forward_entrance.spawn_info = entrance_data["forward"]["spawn_info"]
-            forward_entrance.secondary_exit_infos = entrance_data["forward"].get(
+    return _entrance_shuffle_data
+
+
+def set_all_entrances_data(world: World) -> None:
+    entrance_shuffle_data = get_entrance_shuffle_data()
+
+    for entrance_data in entrance_shuffle_data.entrance_data_list:
+        entrance_type = entrance_data["type"]
+        forward_entrance = world.get_entrance(entrance_data["forward"]["connection"])
+        return_entrance = (
+            world.get_entrance(entrance_data["return"]["connection"])
+            if "return" in entrance_data
+            else None
+        )
+
+        forward_entrance.type = entrance_type
+        forward_entrance.original_type = entrance_type
+        forward_entrance.exit_infos = entrance_data["forward"].get("exit_infos", None)
+        forward_entrance.spawn_info = entrance_data["forward"]["spawn_info"]
+        forward_entrance.secondary_exit_infos = entrance_data["forward"].get(
+            "secondary_exit_infos", None
+        )
+        forward_entrance.secondary_spawn_info = entrance_data["forward"].get(
+            "secondary_spawn_infos", None
+        )
+        forward_entrance.can_start_at = entrance_data["forward"].get(
+            "can_start_at", True
+        )
+        forward_entrance.primary = True
+        forward_entrance.sort_priority = Entrance.sort_counter
+        if conditional_vanilla_connections := entrance_data["forward"].get(
+            "conditional_vanilla_connections", None
+        ):
+            forward_entrance.conditional_vanilla_connections.extend(
+                [world.get_entrance(e) for e in conditional_vanilla_connections]
+            )
+        Entrance.sort_counter += 1
+        if return_entrance != None:
+            return_entrance.type = entrance_type
+            return_entrance.original_type = entrance_type
+            return_entrance.exit_infos = entrance_data["return"].get("exit_infos", None)
+            return_entrance.spawn_info = entrance_data["return"].get("spawn_info", None)
+            return_entrance.secondary_exit_infos = entrance_data["return"].get(
                 "secondary_exit_infos", None
             )
-            forward_entrance.secondary_spawn_info = entrance_data["forward"].get(
-                "secondary_spawn_infos", None
+            return_entrance.secondary_spawn_info = entrance_data["return"].get(
+                "secondary_spawn_info", None
             )
-            forward_entrance.can_start_at = entrance_data["forward"].get(
+            return_entrance.can_start_at = entrance_data["return"].get(
                 "can_start_at", True
             )
-            forward_entrance.primary = True
-            forward_entrance.sort_priority = Entrance.sort_counter
-            if conditional_vanilla_connections := entrance_data["forward"].get(
+            return_entrance.sort_priority = Entrance.sort_counter
+            Entrance.sort_counter += 1
+            if conditional_vanilla_connections := entrance_data["return"].get(
                 "conditional_vanilla_connections", None
             ):
-                forward_entrance.conditional_vanilla_connections.extend(
+                return_entrance.conditional_vanilla_connections.extend(
                     [world.get_entrance(e) for e in conditional_vanilla_connections]
                 )
-            Entrance.sort_counter += 1
-            if return_entrance != None:
-                return_entrance.type = entrance_type
-                return_entrance.original_type = entrance_type
-                return_entrance.exit_infos = entrance_data["return"].get(
-                    "exit_infos", None
-                )
-                return_entrance.spawn_info = entrance_data["return"].get(
-                    "spawn_info", None
-                )
-                return_entrance.secondary_exit_infos = entrance_data["return"].get(
-                    "secondary_exit_infos", None
-                )
-                return_entrance.secondary_spawn_info = entrance_data["return"].get(
-                    "secondary_spawn_info", None
-                )
-                return_entrance.can_start_at = entrance_data["return"].get(
-                    "can_start_at", True
-                )
-                return_entrance.sort_priority = Entrance.sort_counter
-                Entrance.sort_counter += 1
-                if conditional_vanilla_connections := entrance_data["return"].get(
-                    "conditional_vanilla_connections", None
-                ):
-                    return_entrance.conditional_vanilla_connections.extend(
-                        [world.get_entrance(e) for e in conditional_vanilla_connections]
-                    )
-                forward_entrance.bind_two_way(return_entrance)
-
-        # If double doors are to be coupled, add the coupled door's
-        # exit infos to the main door, remove the coupled door entrance,
-        # and rename the main door to be more general
-        if world.setting("decouple_double_doors") == "off":
-            for doors in coupled_doors.values():
-                while doors:
-                    main_door = doors.pop()
-                    coupled_door = next(
-                        iter(
-                            [
-                                door
-                                for door in doors
-                                if door.primary == main_door.primary
-                            ]
-                        )
-                    )
-
-                    # Add the coupled door's exit_infos to the main door
-                    main_door.exit_infos.extend(coupled_door.exit_infos)
+            forward_entrance.bind_two_way(return_entrance)
+
+    # If double doors are to be coupled, add the coupled door's
+    # exit infos to the main door, remove the coupled door entrance,
+    # and rename the main door to be more general
+    if world.setting("decouple_double_doors") == "off":
+        for main_door_name, coupled_door_name in entrance_shuffle_data.coupled_doors:
+            main_door = world.get_entrance(main_door_name)
+            coupled_door = world.get_entrance(coupled_door_name)
+
+            # Add the coupled door's exit_infos to the main door. The lists
+            # are shared with the cached entrance data, so don't extend them
+            main_door.exit_infos = main_door.exit_infos + coupled_door.exit_infos
+
+            # Completely remove the coupled door from the world graph
+            coupled_door.connected_area.entrances.remove(coupled_door)
+            coupled_door.parent_area.exits.remove(coupled_door)
+
+            # Change the main door's name to be more general
+            main_door.original_name = (
+                main_door.original_name.replace(" North", "")
+                .replace(" South", "")
+                .replace(" East", "")
+                .replace(" West", "")
+            )
 
-                    # Completely remove the coupled door from the world graph
-                    doors.remove(coupled_door)
-                    coupled_door.connected_area.entrances.remove(coupled_door)
-                    coupled_door.parent_area.exits.remove(coupled_door)
 
-                    # Change the main door's name to be more general
-                    main_door.original_name = (
-                        main_door.original_name.replace(" North", "")
-                        .replace(" South", "")
-                        .replace(" East", "")
-                        .replace(" West", "")
-                    )
+# Like World.get_shuffleable_entrances, but uses the entrance shuffle
+# data's type index instead of going through every exit in the world
+def get_shuffleable_entrances(
+    world: World, entrance_type: str, only_primary: bool = False
+) -> list[Entrance]:
+    entrance_shuffle_data = get_entrance_shuffle_data()
+    if only_primary:
+        names = entrance_shuffle_data.primary_entrance_names_by_type
+    else:
+        names = entrance_shuffle_data.entrance_names_by_type
+    removed_names = (
+        entrance_shuffle_data.coupled_door_names
+        if world.setting("decouple_double_doors") == "off"
+        else set()
+    )
+    return [
+        world.get_entrance(name)
+        for name in names.get(entrance_type, [])
+        if name not in removed_names
+    ]
 
 
 def create_entrance_pools(world: World) -> EntrancePools:
@@ -198,26 +347,26 @@ def create_entrance_pools(world: World) -> EntrancePools:
     # This reduces the chance of a complete failure of the entrance shuffle
     # algorithm
     if world.setting("random_starting_spawn") != "vanilla":
-        entrance_pools["Spawn"] = world.get_shuffleable_entrances(
-            "Spawn", only_primary=False
+        entrance_pools["Spawn"] = get_shuffleable_entrances(
+            world, "Spawn", only_primary=False
         )
 
     if world.setting("random_starting_statues") == "on":
         # These need to be separate pools since they have different
         # target entrances
-        entrance_pools["Faron Region Entrance"] = world.get_shuffleable_entrances(
-            "Faron Region Entrance", only_primary=False
+        entrance_pools["Faron Region Entrance"] = get_shuffleable_entrances(
+            world, "Faron Region Entrance", only_primary=False
         )
-        entrance_pools["Eldin Region Entrance"] = world.get_shuffleable_entrances(
-            "Eldin Region Entrance", only_primary=False
+        entrance_pools["Eldin Region Entrance"] = get_shuffleable_entrances(
+            world, "Eldin Region Entrance", only_primary=False
         )
-        entrance_pools["Lanayru Region Entrance"] = world.get_shuffleable_entrances(
-            "Lanayru Region Entrance", only_primary=False
+        entrance_pools["Lanayru Region Entrance"] = get_shuffleable_entrances(
+            world, "Lanayru Region Entrance", only_primary=False
         )
 
     if world.setting("randomize_dungeon_entrances") == "on":
-        entrance_pools["Dungeon"] = world.get_shuffleable_entrances(
-            "Dungeon", only_primary=True
+        entrance_pools["Dungeon"] = get_shuffleable_entrances(
+            world, "Dungeon", only_primary=True
         )
         if world.setting("decouple_entrances") == "on":
             entrance_pools["Dungeon Reverse"] = [
@@ -225,8 +374,8 @@ def create_entrance_pools(world: World) -> EntrancePools:
             ]
 
     if world.setting("randomize_trial_gate_entrances") == "on":
-        entrance_pools["Trial Gate"] = world.get_shuffleable_entrances(
-            "Trial Gate", only_primary=True
+        entrance_pools["Trial Gate"] = get_shuffleable_entrances(
+            world, "Trial Gate", only_primary=True
         )
         if world.setting("decouple_entrances") == "on":
             entrance_pools["Trial Gate Reverse"] = [
@@ -234,8 +383,8 @@ def create_entrance_pools(world: World) -> EntrancePools:
             ]
 
     if world.setting("randomize_door_entrances") == "on":
-        entrance_pools["Door"] = world.get_shuffleable_entrances(
-            "Door", only_primary=True
+        entrance_pools["Door"] = get_shuffleable_entrances(
+            world, "Door", only_primary=True
         )
         if world.setting("decouple_entrances") == "on":
             entrance_pools["Door Reverse"] = [
@@ -243,8 +392,8 @@ def create_entrance_pools(world: World) -> EntrancePools:
             ]
 
     if world.setting("randomize_interior_entrances") == "on":
-        entrance_pools["Interior"] = world.get_shuffleable_entrances(
-            "Interior", only_primary=True
+        entrance_pools["Interior"] = get_shuffleable_entrances(
+            world, "Interior", only_primary=True
         )
         if world.setting("decouple_entrances") == "on":
             entrance_pools["Interior Reverse"] = [
@@ -256,8 +405,8 @@ def create_entrance_pools(world: World) -> EntrancePools:
             any("Overworld" in pool for pool in world.setting_map.mixed_entrance_pools)
             and world.setting("decouple_entrances") == "off"
         )
-        entrance_pools["Overworld"] = world.get_shuffleable_entrances(
-            "Overworld", only_primary=exclude_overworld_reverse
+        entrance_pools["Overworld"] = get_shuffleable_entrances(
+            world, "Overworld", only_primary=exclude_overworld_reverse
         )
 
     # Match pool types
@@ -430,7 +579,7 @@ def create_spawn_target_pool(world: World) -> list[Entrance]:
             )
 
     for entrance_type in sorted(shuffled_entrance_types):
-        for entrance in world.get_shuffleable_entrances(entrance_type):
+        for entrance in get_shuffleable_entrances(world, entrance_type):
             if can_start_at_entrance(entrance):
                 new_target_entrance = entrance.get_new_target()
                 target_pool.append(new_target_entrance)
@@ -443,7 +592,7 @@ def create_spawn_target_pool(world: World) -> list[Entrance]:
 
 def create_starting_statue_target_pool(region: str, world: World) -> list[Entrance]:
     target_pool: list[Entrance] = []
-    for entrance in world.get_shuffleable_entrances("Bird Statue"):
+    for entrance in get_shuffleable_entrances(world, "Bird Statue"):
         if (
             entrance.can_start_at
             and entrance.original_name != "Eldin Pillar -> Inside the Volcano Statue"
@@ -552,6 +701,7 @@ def shuffle_non_assumed_entrance_pools(
     worlds: list[World],
     entrance_pools: EntrancePools,
     target_entrance_pools: EntrancePools,
+    stats: EntrancePoolStats,
 ):
     non_assumed_entrances = {
         pool[0]: target_entrance_pools[type]
@@ -576,6 +726,8 @@ def shuffle_non_assumed_entrance_pools(
             rollbacks.append((entrance, random_target))
             change_connections(entrance, random_target)
 
+        stats.attempts += 1
+        validation_start = time.perf_counter()
         try:
             # Then try to validate the world
             validate_world(world, worlds, None, item_pool)
@@ -591,8 +743,13 @@ def shuffle_non_assumed_entrance_pools(
                 f"Failed to connect non-assumed entrances. Reason {e}"
             )
             retries -= 1
+            profile_count(RETRIES)
+            stats.rejections[e.reason] += 1
+            stats.retries += 1
             for entrance, target in rollbacks:
                 restore_connections(entrance, target)
+        finally:
+            stats.validation_time += time.perf_counter() - validation_start
 
     if retries <= 0:
         raise EntranceShuffleError(
@@ -604,33 +761,84 @@ def shuffle_non_assumed_entrance_pools(
         entrance_pools.pop(type, None)
 
 
+# Shuffles the entrances in the pool, retrying the whole pool if they can't all
+# be connected. Each retry is a separately seeded attempt and attempts can be run
+# in parallel by multiple worker processes. The lowest index attempt which
+# succeeds gets applied, so the resulting connections are the same for a given
+# seed regardless of how many workers are used (including none, in which case
+# the attempts are run one by one in this process). Only the stats of the
+# attempt which succeeds are kept, along with the number of attempts before it
+# as retries.
 def shuffle_entrance_pool(
     world: World,
     worlds: list[World],
     entrance_pool: EntrancePool,
     target_entrance_pools: EntrancePool,
+    graph: "StructuralGraph",
+    stats: EntrancePoolStats,
     retries: int = 20,
+    workers: int = 0,
+    candidate_workers: int = 0,
 ) -> None:
-    while retries > 0:
-        retries -= 1
+    # Attempts refer to entrances and targets by their index in these lists
+    # since the entrances themselves can't be sent back from worker processes
+    entrances = entrance_pool.copy()
+    targets = target_entrance_pools.copy()
+    entrance_indices = {entrance: i for i, entrance in enumerate(entrances)}
+    target_indices = {target: i for i, target in enumerate(targets)}
+
+    # Perform a single shuffle attempt and return the connections it made.
+    # The connections are undone afterwards so the next attempt starts fresh.
+    def shuffle_attempt(
+        index: int,
+    ) -> tuple[list[tuple[int, int]], EntrancePoolStats] | None:
         rollbacks = []
+        result = None
+        attempt_stats = EntrancePoolStats()
         try:
-            shuffle_entrances(worlds, entrance_pool, target_entrance_pools, rollbacks)
-            for entrance, target in rollbacks:
-                confirm_replacement(entrance, target)
-            for target in target_entrance_pools:
-                delete_target_entrance(target)
-            return
-
+            shuffle_entrances(
+                worlds,
+                entrance_pool,
+                target_entrance_pools,
+                rollbacks,
+                graph,
+                attempt_stats,
+                candidate_workers,
+            )
+            connections = [
+                (entrance_indices[entrance], target_indices[target])
+                for entrance, target in rollbacks
+            ]
+            result = (connections, attempt_stats)
         except EntranceShuffleError as error:
-            for entrance, target in rollbacks:
-                restore_connections(entrance, target)
             logging.getLogger("").debug(
-                f"Failed to place all entrances in a pool for {world}. Will retry {retries} more times"
+                f"Entrance shuffle attempt {index} failed for {world}"
             )
             logging.getLogger("").debug(f"\t{error}")
+            profile_count(RETRIES)
 
-    raise EntranceShuffleError("Ran out of retries when shuffling entrances")
+        # Undo connections in the opposite order they were made in
+        for entrance, target in reversed(rollbacks):
+            restore_connections(entrance, target)
+        return result
+
+    result = run_speculative_attempts(shuffle_attempt, retries, workers)
+    if result is None:
+        stats.retries += retries
+        raise EntranceShuffleError("Ran out of retries when shuffling entrances")
+
+    index, (connections, attempt_stats) = result
+    stats.add(attempt_stats)
+    stats.retries += index
+    logging.getLogger("").debug(
+        f"Using connections from entrance shuffle attempt {index}"
+    )
+    for entrance_index, target_index in connections:
+        change_connections(entrances[entrance_index], targets[target_index])
+    for entrance_index, target_index in connections:
+        confirm_replacement(entrances[entrance_index], targets[target_index])
+    for target in target_entrance_pools:
+        delete_target_entrance(target)
 
 
 def shuffle_entrances(
@@ -638,8 +846,24 @@ def shuffle_entrances(
     entrance_pool: list[Entrance],
     target_entrance_pool: list[Entrance],
     rollbacks: list[tuple[Entrance, Entrance]],
+    graph: "StructuralGraph",
+    stats: EntrancePoolStats,
+    candidate_workers: int = 0,
 ) -> None:
+    if candidate_workers > 1 and can_fork_workers():
+        shuffle_entrances_with_candidate_workers(
+            worlds,
+            entrance_pool,
+            target_entrance_pool,
+            rollbacks,
+            candidate_workers,
+            graph,
+            stats,
+        )
+        return
+
     complete_item_pool = get_complete_item_pool(worlds)
+    validation = EntranceValidation()
     random.shuffle(entrance_pool)
 
     for entrance in entrance_pool:
@@ -652,7 +876,14 @@ def shuffle_entrances(
                 continue
 
             if replace_entrance(
-                worlds, entrance, target, rollbacks, complete_item_pool
+                worlds,
+                entrance,
+                target,
+                rollbacks,
+                complete_item_pool,
+                graph,
+                stats,
+                validation,
             ):
                 break
 
@@ -662,25 +893,186 @@ def shuffle_entrances(
             )
 
 
+# State for validating entrance candidates in worker processes. Workers are
+# forked with a copy of the worlds and keep it in sync with the connections
+# made by the main process, which refers to entrances and targets by their
+# index in these lists.
+_candidate_worlds: list[World] = []
+_candidate_entrances: list[Entrance] = []
+_candidate_targets: list[Entrance] = []
+_candidate_connections: list[tuple[int, int]] = []
+_candidate_graph: "StructuralGraph | None" = None
+
+
+# Bring this worker's copy of the worlds in line with the connections the
+# main process has made, then try connecting a single candidate. Returns
+# the error if the candidate isn't valid (or None if it is), whether sphere
+# zero locations are reachable, and how long validation took.
+def _validate_candidate(
+    task: tuple[list[tuple[int, int]], int, int, bool, bool]
+) -> tuple[EntranceShuffleError | None, bool, float]:
+    global _candidate_connections
+    connections, entrance_index, target_index, logic_satisfied, sphere_zero = task
+
+    # Undo any connections the main process has since undone, then
+    # make the connections this worker hasn't seen yet
+    common = 0
+    while (
+        common < min(len(connections), len(_candidate_connections))
+        and connections[common] == _candidate_connections[common]
+    ):
+        common += 1
+    for made_entrance, made_target in reversed(_candidate_connections[common:]):
+        restore_connections(
+            _candidate_entrances[made_entrance], _candidate_targets[made_target]
+        )
+    for made_entrance, made_target in connections[common:]:
+        change_connections(
+            _candidate_entrances[made_entrance], _candidate_targets[made_target]
+        )
+    _candidate_connections = connections
+
+    entrance = _candidate_entrances[entrance_index]
+    target = _candidate_targets[target_index]
+    validation = EntranceValidation()
+    validation.logic_satisfied = logic_satisfied
+    validation.sphere_zero_locations_reachable = sphere_zero
+    validation_start = time.perf_counter()
+    try:
+        check_entrances_compatibility(entrance, target)
+        change_connections(entrance, target)
+        check_structural_reachability(entrance, _candidate_graph)
+        validate_world(
+            entrance.world,
+            _candidate_worlds,
+            entrance,
+            get_complete_item_pool(_candidate_worlds),
+            validation,
+        )
+        return (
+            None,
+            validation.sphere_zero_locations_reachable,
+            time.perf_counter() - validation_start,
+        )
+    except EntranceShuffleError as error:
+        return error, sphere_zero, time.perf_counter() - validation_start
+    finally:
+        if entrance.connected_area:
+            restore_connections(entrance, target)
+
+
+# Same as shuffle_entrances, except the target candidates for each entrance
+# are validated in batches of candidate_workers at a time by worker processes.
+# The first valid candidate in the shuffled order is always the one used, so
+# the resulting connections are the same as when shuffling serially.
+def shuffle_entrances_with_candidate_workers(
+    worlds: list[World],
+    entrance_pool: list[Entrance],
+    target_entrance_pool: list[Entrance],
+    rollbacks: list[tuple[Entrance, Entrance]],
+    candidate_workers: int,
+    graph: "StructuralGraph",
+    stats: EntrancePoolStats,
+) -> None:
+    global _candidate_worlds, _candidate_entrances, _candidate_targets
+    global _candidate_connections, _candidate_graph
+
+    _candidate_worlds = worlds
+    _candidate_graph = graph
+    _candidate_entrances = entrance_pool.copy()
+    _candidate_targets = target_entrance_pool.copy()
+    _candidate_connections = []
+    entrance_indices = {e: i for i, e in enumerate(_candidate_entrances)}
+    target_indices = {t: i for i, t in enumerate(_candidate_targets)}
+
+    validation = EntranceValidation()
+    random.shuffle(entrance_pool)
+
+    with mp.get_context("fork").Pool(candidate_workers) as pool:
+        for entrance in entrance_pool:
+            if entrance.connected_area is not None:
+                continue
+            random.shuffle(target_entrance_pool)
+
+            candidates = [
+                target
+                for target in target_entrance_pool
+                if target.connected_area is not None
+            ]
+            connections = [
+                (entrance_indices[made_entrance], target_indices[made_target])
+                for made_entrance, made_target in rollbacks
+            ]
+            for batch_start in range(0, len(candidates), candidate_workers):
+                batch = candidates[batch_start : batch_start + candidate_workers]
+                tasks = [
+                    (
+                        connections,
+                        entrance_indices[entrance],
+                        target_indices[target],
+                        validation.logic_satisfied,
+                        validation.sphere_zero_locations_reachable,
+                    )
+                    for target in batch
+                ]
+                results = pool.map(_validate_candidate, tasks)
+
+                # Only count the candidates a serial shuffle would've tried
+                for target, (error, sphere_zero, validation_time) in zip(
+                    batch, results
+                ):
+                    stats.attempts += 1
+                    stats.validation_time += validation_time
+                    if error is not None:
+                        logging.getLogger("").debug(
+                            f"Failed to connect {entrance} to {target.replaces.original_name} (Reason: {error}) {entrance.world}"
+                        )
+                        stats.rejections[error.reason] += 1
+                        continue
+
+                    change_connections(entrance, target)
+                    rollbacks.append((entrance, target))
+                    validation.logic_satisfied = True
+                    validation.sphere_zero_locations_reachable = sphere_zero
+                    break
+
+                if entrance.connected_area is not None:
+                    break
+
+            if entrance.connected_area is None:
+                raise EntranceShuffleError(
+                    f"No more valid entrances to replace {entrance} in {entrance.world}"
+                )
+
+
 def replace_entrance(
     worlds: list[World],
     entrance: Entrance,
     target: Entrance,
     rollbacks: list[tuple[Entrance, Entrance]],
     complete_item_pool: Counter[Item],
-) -> None:
+    graph: "StructuralGraph",
+    stats: EntrancePoolStats,
+    validation: EntranceValidation | None = None,
+) -> bool:
+    stats.attempts += 1
+    validation_start = time.perf_counter()
     try:
         check_entrances_compatibility(entrance, target)
         change_connections(entrance, target)
-        validate_world(entrance.world, worlds, entrance, complete_item_pool)
+        check_structural_reachability(entrance, graph)
+        validate_world(entrance.world, worlds, entrance, complete_item_pool, validation)
         rollbacks.append((entrance, target))
         return True
     except EntranceShuffleError as error:
         logging.getLogger("").debug(
             f"Failed to connect {entrance} to {target.replaces.original_name} (Reason: {error}) {entrance.world}"
         )
+        stats.rejections[error.reason] += 1
         if entrance.connected_area:
             restore_connections(entrance, target)
+    finally:
+        stats.validation_time += time.perf_counter() - validation_start
     return False
 
 
@@ -705,7 +1097,7 @@ def set_shuffled_entrances(entrance_pools: EntrancePools) -> None:
 
 def check_entrances_compatibility(entrance: Entrance, target: Entrance) -> None:
     if entrance.reverse and entrance.reverse == target.replaces:
-        raise EntranceShuffleError(f"Attempted self-connection")
+        raise EntranceShuffleError(f"Attempted self-connection", SELF_CONNECTION)
 
 
 def change_connections(entrance: Entrance, target: Entrance) -> None:
@@ -745,12 +1137,179 @@ def delete_target_entrance(target: Entrance) -> None:
         target.parent_area = None
 
 
+# The areas of a world condensed into their strongly connected components over
+# the exits which can't change while a pool is being shuffled. That's every exit
+# except shuffled ones, the root's (which include the assumed targets) and
+# conditional vanilla connections. None of those change during entrance shuffle,
+# so it's built once per world and checking structural reachability only walks
+# the components and the exits which can change instead of the whole graph.
+class StructuralGraph:
+    def __init__(self, world: World) -> None:
+        self.world: World = world
+        conditional_exits = {
+            conditional_exit
+            for area in world.areas.values()
+            for exit_ in area.exits
+            for conditional_exit in exit_.conditional_vanilla_connections
+        }
+
+        def is_static(exit_: Entrance) -> bool:
+            return not (
+                exit_.shuffled
+                or exit_.parent_area == world.root
+                or exit_ in conditional_exits
+            )
+
+        def get_static_connected_areas(area: "Area") -> list["Area"]:
+            return [
+                exit_.connected_area
+                for exit_ in area.exits
+                if is_static(exit_)
+                and not exit_.disabled
+                and exit_.connected_area is not None
+            ]
+
+        # Tarjan's algorithm, iteratively since the graph can be deep
+        self.component: dict["Area", int] = {}
+        num_components = 0
+        index: dict["Area", int] = {}
+        lowlink: dict["Area", int] = {}
+        area_stack: list["Area"] = []
+        on_stack: set["Area"] = set()
+        for start_area in world.areas.values():
+            if start_area in index:
+                continue
+            index[start_area] = lowlink[start_area] = len(index)
+            area_stack.append(start_area)
+            on_stack.add(start_area)
+            work = [(start_area, iter(get_static_connected_areas(start_area)))]
+            while work:
+                area, connected_areas = work[-1]
+                for connected_area in connected_areas:
+                    if connected_area not in index:
+                        index[connected_area] = lowlink[connected_area] = len(index)
+                        area_stack.append(connected_area)
+                        on_stack.add(connected_area)
+                        work.append(
+                            (
+                                connected_area,
+                                iter(get_static_connected_areas(connected_area)),
+                            )
+                        )
+                        break
+                    if connected_area in on_stack:
+                        lowlink[area] = min(lowlink[area], index[connected_area])
+                else:
+                    work.pop()
+                    if work:
+                        parent_area = work[-1][0]
+                        lowlink[parent_area] = min(lowlink[parent_area], lowlink[area])
+                    if lowlink[area] == index[area]:
+                        while True:
+                            member = area_stack.pop()
+                            on_stack.remove(member)
+                            self.component[member] = num_components
+                            if member == area:
+                                break
+                        num_components += 1
+
+        self.component_edges: list[set[int]] = [set() for _ in range(num_components)]
+        self.dynamic_exits: list[list[Entrance]] = [[] for _ in range(num_components)]
+        for area in world.areas.values():
+            component = self.component[area]
+            for exit_ in area.exits:
+                if not is_static(exit_):
+                    self.dynamic_exits[component].append(exit_)
+                elif not exit_.disabled and exit_.connected_area is not None:
+                    self.component_edges[component].add(
+                        self.component[exit_.connected_area]
+                    )
+            self.component_edges[component].discard(component)
+
+        # The root has no static exits, so it's always in a component of its
+        # own. Use its list of exits directly so targets added later are seen.
+        self.dynamic_exits[self.component[world.root]] = world.root.exits
+
+    def get_connected_components(self, component: int) -> Iterable[int]:
+        yield from self.component_edges[component]
+        for exit_ in self.dynamic_exits[component]:
+            if not exit_.disabled and exit_.connected_area is not None:
+                yield self.component[exit_.connected_area]
+
+
+# Cheap check to run before validate_world which ignores all requirements.
+# The areas which just lost their assumed access from the root have to be
+# reachable from the root some other way. If they aren't, and the world needs
+# all locations to be reachable, then a location that can't be reached even
+# when ignoring requirements means the connection could never pass validation.
+def check_structural_reachability(entrance: Entrance, graph: StructuralGraph) -> None:
+    world = entrance.world
+    if world.setting("logic_rules") != "all_locations_reachable":
+        return
+
+    components_to_reach = {graph.component[entrance.connected_area]}
+    if entrance.reverse and not entrance.decoupled:
+        components_to_reach.add(
+            graph.component[entrance.replaces.reverse.connected_area]
+        )
+
+    root_component = graph.component[world.root]
+    components_to_reach.discard(root_component)
+    if not components_to_reach:
+        return
+
+    reachable_components = {root_component}
+    components_to_explore = [root_component]
+    while components_to_explore:
+        component = components_to_explore.pop()
+        for connected_component in graph.get_connected_components(component):
+            if connected_component in reachable_components:
+                continue
+            reachable_components.add(connected_component)
+            components_to_explore.append(connected_component)
+            components_to_reach.discard(connected_component)
+            if not components_to_reach:
+                return
+
+    for location in world.location_table.values():
+        if "Allowed Unreachable" not in location.types and not any(
+            graph.component[la.area] in reachable_components
+            for la in location.loc_access_list
+        ):
+            raise EntranceShuffleError(
+                f"{location} can't be reached from the root even ignoring requirements",
+                UNREACHABLE_LOCATIONS,
+            )
+
+
+# Passing in validation lets the world be validated incrementally after
+# each new connection made by the entrance, as long as every change to the
+# world since the last validation went through validate_world.
 def validate_world(
-    world: World, worlds: list[World], entrance: Entrance, item_pool: Counter[Item]
+    world: World,
+    worlds: list[World],
+    entrance: Entrance,
+    item_pool: Counter[Item],
+    validation: EntranceValidation | None = None,
 ) -> None:
+    # If logic was satisfied before this connection, it's still satisfied
+    # as long as the areas on both ends of the connection are still reached
+    # at all times of day, like they were from the root while assumed
+    areas_to_reach: dict[int, int] = {}
+    if validation is not None and validation.logic_satisfied:
+        areas_to_reach[entrance.connected_area.id] = TOD.ALL
+        if entrance.reverse and not entrance.decoupled:
+            areas_to_reach[entrance.replaces.reverse.connected_area.id] = TOD.ALL
+
     # Validate that the world is still beatable
-    if not all_logic_satisfied(worlds, item_pool):
-        raise EntranceShuffleError(f"Not all logic is satisfied!")
+    if not all_logic_satisfied(worlds, item_pool, areas_to_reach):
+        raise EntranceShuffleError(f"Not all logic is satisfied!", LOGIC_UNSATISFIED)
+
+    # Connections never take anything away from a sphere zero search (which
+    # doesn't use the assumed entrances), so once sphere zero locations have
+    # been found they stay reachable
+    if validation is not None and validation.sphere_zero_locations_reachable:
+        return
 
     # Check to make sure that there's at least 1 sphere 0 location reachable
     # with no items except the starting inventory
@@ -762,4 +1321,10 @@ def validate_world(
         if l.progression and "Goddess Cube" not in l.types
     ]
     if len(sphere_zero_locs) == 0 and not sphere_zero_search.found_disconnected_exit:
-        raise EntranceShuffleError(f"No Sphere 0 locations reachable at the start!")
+        raise EntranceShuffleError(
+            f"No Sphere 0 locations reachable at the start!", NO_SPHERE_ZERO_LOCATIONS
+        )
+
+    if validation is not None:
+        validation.logic_satisfied = True
+        validation.sphere_zero_locations_reachable = len(sphere_zero_locs) > 0
@@ -1,10 +1,23 @@
 from .world import *
 from .search import *
+from .parallel import run_speculative_attempts
+from .profiler import profile_count, profile_phase, RETRIES, BACKTRACKS
 
 import random
 import logging
 
 
+# How many times assumed fill will restart from scratch before giving up
+ASSUMED_FILL_RETRIES: int = 10
+# How many times a single assumed fill attempt can try undoing only the
+# placements blocking an item before it restarts the whole attempt
+ASSUMED_FILL_BACKTRACKS: int = 5
+# How many searches a single assumed fill attempt can spend on undoing placements,
+# as a fraction of the items it places. Every undone item has to be placed again,
+# so past this point backtracking would cost about as much as restarting.
+ASSUMED_FILL_BACKTRACK_SEARCH_RATIO: float = 0.25
+
+
 class FillError(RuntimeError):
     pass
 
@@ -13,40 +26,43 @@ class GameNotBeatableError(RuntimeError):
     pass
 
 
-def fill_worlds(worlds: list[World]):
+def fill_worlds(worlds: list[World], workers: int = 0):
     # Cache potential area times for each world
     # so we cut down on exit evaluation iterations
     cache_area_and_exit_times(worlds)
 
     # TODO: Have each world handle special cases before the fill
 
-    # Place Own Worlds Restricted items first
-    # and sanitize the item pool afterwards
+    # Place all worlds' restricted items first
+    # and sanitize the item pools afterwards
+    place_restricted_items(worlds)
     for world in worlds:
-        place_restricted_items(world, worlds)
         world.sanitize_item_pool()
         world.add_traps()
 
-    item_pool: list[Item] = []
+    major_items: list[Item] = []
+    non_major_item_pool: Counter[Item] = Counter()
     all_locations: list[Location] = []
 
-    # Combine all worlds' item pools and location pools
+    # Combine all worlds' item pools and location pools. Only major items
+    # need to be placed one by one, so keep the rest of the items as counts
     for world in worlds:
         # Filter out hint locations
         all_locations.extend(world.get_all_item_locations())
         for item, count in world.item_pool.items():
-            item_pool.extend([item] * count)
+            if item.is_major_item:
+                major_items.extend([item] * count)
+            elif count > 0:
+                non_major_item_pool[item] += count
 
     # Place remaining major items in progress locations
-    major_items = [item for item in item_pool if item.is_major_item]
     progress_locations = [loc for loc in all_locations if loc.progression]
-    assumed_fill(worlds, major_items, [], progress_locations)
-
-    # Remove major items from item pool
-    item_pool = [item for item in item_pool if not item.is_major_item]
+    with profile_phase("Major Item Fill"):
+        speculative_assumed_fill(worlds, major_items, [], progress_locations, workers)
 
     # Place the rest of the items with fast fill
-    fast_fill(item_pool, all_locations)
+    with profile_phase("Fast Fill"):
+        fast_fill(non_major_item_pool, all_locations)
 
     if not all_logic_satisfied(worlds):
         # Uncomment if necessary for debugging
@@ -61,23 +77,35 @@ def fill_worlds(worlds: list[World]):
 # we first startwith all the items, take an item out, search for
 # available locations (picking up any placed items along the way),
 # and choose a random location of the available ones to place the item.
-# Repeat for all items in the items_to_place_list.
+# Repeat for all items in the items_to_place_list. Items which have an
+# entry in item_locations can only be placed in those locations instead
+# of allowed_locations. Items which have an entry in item_groups are placed
+# in the order of their groups, and only shuffled within them.
 def assumed_fill(
     worlds: list[World],
     items_to_place_list: list[Item],
-    items_not_yet_placed: list[Item],
+    items_not_yet_placed: list[Item] | Mapping[Item, int],
     allowed_locations: list[Location],
     world_to_fill: int = -1,
+    backtracks: int = ASSUMED_FILL_BACKTRACKS,
+    retries: int = ASSUMED_FILL_RETRIES,
+    item_locations: dict[Item, list[Location]] = {},
+    item_groups: dict[Item, int] = {},
 ) -> None:
     # Sort locations to keep consistency incase a set
     # was passed in
     allowed_locations.sort()
+    for locations in item_locations.values():
+        locations.sort()
+
+    # Keep the items not being placed as counts (and take a copy of them
+    # incase a view of the complete item pool was passed in)
+    items_not_yet_placed = Counter(items_not_yet_placed)
 
     # Assumed Fill will sometimes place items in such a way
     # that accidentally locks out being able to place specific
     # items anywhere. Allow the algorithm to retry a reasonable
     # amount of times before throwing an error.
-    retries: int = 10
     unsuccessful_placement: bool = True
     while unsuccessful_placement:
         if retries <= 0:
@@ -88,62 +116,63 @@ def assumed_fill(
         unsuccessful_placement = False
 
         random.shuffle(items_to_place_list)
+        # Items are placed from the end of the list, so the first group goes
+        # last. The sort is stable, so each group stays in a random order.
+        if item_groups:
+            items_to_place_list.sort(key=lambda item: item_groups[item], reverse=True)
         items_to_place = items_to_place_list.copy()
         rollbacks: list[Location] = []
+        backtracks_left = backtracks
+        backtrack_searches_left = int(
+            len(items_to_place_list) * ASSUMED_FILL_BACKTRACK_SEARCH_RATIO
+        )
 
         while len(items_to_place) > 0:
             # Get a random item to place
             item_to_place = items_to_place.pop()
-
-            random.shuffle(allowed_locations)
-            spot_to_fill: Location = None
+            # Items can have their own allowed locations instead of the shared ones
+            locations_for_item = item_locations.get(item_to_place, allowed_locations)
 
             # Assume we have all the items which haven't been placed yet except the one we're about to place
-            assumed_items = items_not_yet_placed.copy()
-            assumed_items.extend(items_to_place)
-            search = Search(
-                SearchMode.ACCESSIBLE_LOCATIONS, worlds, assumed_items, world_to_fill
+            spot_to_fill, search = find_fill_location(
+                worlds,
+                item_to_place,
+                items_not_yet_placed + Counter(items_to_place),
+                locations_for_item,
+                world_to_fill,
             )
-            search.search_worlds()
-
-            # Loop through the shuffled locations until we find a valid one.
-            # If a world is only checking for beatable logic, then we can ignore
-            # any access checks and just choose a random location if the world is already beatable
-            can_choose_any_location = (
-                item_to_place.world.setting("logic_rules") == "beatable_only"
-                and item_to_place.world.get_game_winning_item() in search.owned_items
-            )
-            for location in allowed_locations:
-                # Get all reachable Location Access spots for this location
-                loc_acc_list = [
-                    la
-                    for la in location.loc_access_list
-                    if can_choose_any_location or la.area in search.visited_areas
-                ]
-                # If this location is not empty, or has no potentially reachable
-                # Location Access spot, then we can't place the item here
-                if not location.is_empty() or not loc_acc_list:
-                    continue
-
-                if any(
-                    [
-                        True
-                        for la in loc_acc_list
-                        if can_choose_any_location
-                        or evaluate_location_requirement(search, la)
-                        == EvalSuccess.COMPLETE
-                    ]
-                ):
-                    spot_to_fill = location
-                    break
-
-            # If we couldn't find a spot to place this item, undo
+
+            # If we couldn't find a spot to place this item, first try
+            # undoing only the placements which are blocking it before
+            # giving up on the whole fill attempt
+            if (
+                spot_to_fill == None
+                and backtracks_left > 0
+                and backtrack_searches_left > 0
+            ):
+                backtracks_left -= 1
+                profile_count(BACKTRACKS)
+                spot_to_fill, searches = backtrack_fill(
+                    worlds,
+                    item_to_place,
+                    items_to_place,
+                    items_not_yet_placed,
+                    locations_for_item,
+                    rollbacks,
+                    search,
+                    backtrack_searches_left,
+                    world_to_fill,
+                )
+                backtrack_searches_left -= searches
+
+            # If we still couldn't find a spot to place this item, undo
             # all item placements within this fill attempt and try
             # again from the top.
             if spot_to_fill == None:
                 logging.getLogger("").debug(
                     f"No accessible locations to place {item_to_place}. Retrying {retries} more times."
                 )
+                profile_count(RETRIES)
                 for location in rollbacks:
                     items_to_place.append(location.current_item)
                     location.remove_current_item()
@@ -160,30 +189,255 @@ def assumed_fill(
             rollbacks.append(spot_to_fill)
 
 
-# Place the items in items_to_place completel randomly within the allowed locations.
-# There are no logic checks with this fill.
-def fast_fill(items_to_place: list[Item], allowed_locations: list[Location]) -> None:
+# Same as assumed_fill, except each retry is a separately seeded attempt and
+# attempts can be run in parallel by multiple worker processes. The lowest
+# index attempt which succeeds gets applied, so the resulting placements are
+# the same for a given seed regardless of how many workers are used (including
+# none, in which case the attempts are run one by one in this process).
+def speculative_assumed_fill(
+    worlds: list[World],
+    items_to_place_list: list[Item],
+    items_not_yet_placed: list[Item] | Mapping[Item, int],
+    allowed_locations: list[Location],
+    workers: int,
+    world_to_fill: int = -1,
+) -> None:
+    allowed_locations.sort()
+    empty_locations = [loc for loc in allowed_locations if loc.is_empty()]
+
+    # Perform a single fill attempt and return what it placed where
+    # (by name, so it can be sent back from a worker process). The
+    # placements are undone afterwards so the next attempt starts fresh.
+    def fill_attempt(index: int) -> list[tuple[int, str, int, str]] | None:
+        try:
+            assumed_fill(
+                worlds,
+                items_to_place_list.copy(),
+                items_not_yet_placed,
+                allowed_locations,
+                world_to_fill,
+                retries=1,
+            )
+        except FillError:
+            logging.getLogger("").debug(f"Speculative fill attempt {index} failed")
+            return None
+
+        placements = []
+        for location in empty_locations:
+            if not location.is_empty():
+                item = location.current_item
+                placements.append(
+                    (location.world.id, location.name, item.world.id, item.name)
+                )
+                location.remove_current_item()
+        return placements
+
+    result = run_speculative_attempts(fill_attempt, ASSUMED_FILL_RETRIES, workers)
+    if result is None:
+        raise FillError(
+            f"Ran out of retries while attempting to place items: {[item.name for item in items_to_place_list]}"
+        )
+
+    index, placements = result
+    logging.getLogger("").debug(f"Using placements from fill attempt {index}")
+    for location_world_id, location_name, item_world_id, item_name in placements:
+        location = worlds[location_world_id].get_location(location_name)
+        location.set_current_item(worlds[item_world_id].get_item(item_name))
+
+
+# Searches with the assumed items and returns a random empty location
+# out of allowed_locations that item_to_place can be logically placed at,
+# or None if there isn't one. The search is also returned so that callers
+# can see what was reachable.
+def find_fill_location(
+    worlds: list[World],
+    item_to_place: Item,
+    assumed_items: Counter[Item],
+    allowed_locations: list[Location],
+    world_to_fill: int = -1,
+) -> tuple[Location | None, Search]:
+    random.shuffle(allowed_locations)
+
+    search = Search(
+        SearchMode.ACCESSIBLE_LOCATIONS, worlds, assumed_items, world_to_fill
+    )
+    search.search_worlds()
+
+    # Loop through the shuffled locations until we find a valid one.
+    # If a world is only checking for beatable logic, then we can ignore
+    # any access checks and just choose a random location if the world is already beatable
+    can_choose_any_location = (
+        item_to_place.world.setting("logic_rules") == "beatable_only"
+        and item_to_place.world.get_game_winning_item() in search.owned_items
+    )
+    for location in allowed_locations:
+        # Get all reachable Location Access spots for this location
+        loc_acc_list = [
+            la
+            for la in location.loc_access_list
+            if can_choose_any_location or la.area in search.visited_areas
+        ]
+        # If this location is not empty, or has no potentially reachable
+        # Location Access spot, then we can't place the item here
+        if not location.is_empty() or not loc_acc_list:
+            continue
+
+        if any(
+            [
+                True
+                for la in loc_acc_list
+                if can_choose_any_location
+                or evaluate_location_requirement(search, la) == EvalSuccess.COMPLETE
+            ]
+        ):
+            return location, search
+
+    return None, search
+
+
+# Targeted backtracking for when item_to_place has nowhere to go. Rather than
+# undoing the entire fill attempt, only undo placements which could be blocking
+# the item, starting with the most recent. A placement can only be blocking if
+# it either takes up an allowed location the item could have reached, or sits
+# somewhere unreachable (so its item may be what the item needs to be placed).
+# Any reachable placement outside the allowed locations gets collected by the
+# search either way, so undoing it wouldn't change anything. Undone items go
+# back into items_to_place to be placed again. At most max_searches placements
+# are undone, with a search after each one. Returns the location to place
+# item_to_place at (or None if undoing the blocking placements didn't help),
+# along with how many searches were done.
+def backtrack_fill(
+    worlds: list[World],
+    item_to_place: Item,
+    items_to_place: list[Item],
+    items_not_yet_placed: Counter[Item],
+    allowed_locations: list[Location],
+    rollbacks: list[Location],
+    search: Search,
+    max_searches: int,
+    world_to_fill: int = -1,
+) -> tuple[Location | None, int]:
+    allowed_locations_set = set(allowed_locations)
+    blocking_placements = [
+        location
+        for location in reversed(rollbacks)
+        if location not in search.visited_locations or location in allowed_locations_set
+    ][:max_searches]
+
+    for searches, location in enumerate(blocking_placements, start=1):
+        logging.getLogger("").debug(
+            f"Undoing placement of {location.current_item} at {location} to make room for {item_to_place}"
+        )
+        items_to_place.append(location.current_item)
+        location.remove_current_item()
+        rollbacks.remove(location)
+
+        spot_to_fill, _ = find_fill_location(
+            worlds,
+            item_to_place,
+            items_not_yet_placed + Counter(items_to_place),
+            allowed_locations,
+            world_to_fill,
+        )
+        if spot_to_fill != None:
+            return spot_to_fill, searches
+
+    return None, len(blocking_placements)
+
+
+# Place the items in items_to_place completely randomly within the allowed locations.
+# There are no logic checks with this fill. Items are given as counts, and a random
+# selection of them is assigned to a random selection of the empty locations in one
+# go, without expanding the counts into a list of items first.
+def fast_fill(items_to_place: Counter[Item], allowed_locations: list[Location]) -> None:
     empty_locations = [
         location for location in allowed_locations if location.is_empty()
     ]
-    if len(items_to_place) > len(empty_locations):
+    num_items = items_to_place.total()
+    if num_items > len(empty_locations):
         print(
-            f"WARNING: more items than locations when placing items with fast fill. Items: {len(items_to_place)} Locations: {len(empty_locations)}"
+            f"WARNING: more items than locations when placing items with fast fill. Items: {num_items} Locations: {len(empty_locations)}"
+        )
+
+    num_to_place = min(num_items, len(empty_locations))
+    # random.sample can't sample from an empty population, even when
+    # no items are being chosen
+    if num_to_place <= 0:
+        return
+
+    items = list(items_to_place.keys())
+    chosen_items = random.sample(
+        items, num_to_place, counts=[items_to_place[item] for item in items]
+    )
+    chosen_locations = random.sample(empty_locations, num_to_place)
+    for location, item in zip(chosen_locations, chosen_items):
+        location.set_current_item(item)
+
+
+# Place every world's restricted items. Goal locations are filled first, then
+# all dungeon items (and caves keys) which are restricted to certain locations
+# are placed together in a single assumed fill, where each item can only go in
+# the locations its setting restricts it to. The items are still placed in the
+# same order as separate fills for each world would place them, with the most
+# restricted items first: own dungeon, own region, any dungeon, then overworld.
+def place_restricted_items(worlds: list[World]) -> None:
+    for world in worlds:
+        with profile_phase(f"Fill Required Dungeon Goal Locations ({world})"):
+            fill_required_dungeon_goal_locations(world, worlds)
+
+    # Maps restricted to their own dungeon have to be placed without
+    # the boss key, so they get placed on their own beforehand
+    with profile_phase("Place Restricted Maps"):
+        place_own_dungeon_restricted_maps(worlds)
+
+    with profile_phase("Place Restricted Items"):
+        restricted_items: list[Item] = []
+        item_locations: dict[Item, list[Location]] = {}
+        item_groups: dict[Item, int] = {}
+        group = 0
+        for world in worlds:
+            for collect_items in [
+                collect_own_dungeon_items,
+                collect_own_region_items,
+                collect_any_dungeon_items,
+                collect_overworld_items,
+            ]:
+                collect_items(world, restricted_items, item_locations)
+                for item in item_locations:
+                    item_groups.setdefault(item, group)
+                group += 1
+
+        # Get the complete item pool for all worlds incase of multiworld
+        # plandomized items that are required to get to these locations.
+        # Separate fills would each get their own retries, so allow as many
+        # for the combined fill.
+        complete_item_pool = get_complete_item_pool(worlds)
+        num_groups = len({item_groups[item] for item in restricted_items})
+        assumed_fill(
+            worlds,
+            restricted_items,
+            complete_item_pool,
+            [],
+            retries=ASSUMED_FILL_RETRIES * max(num_groups, 1),
+            item_locations=item_locations,
+            item_groups=item_groups,
         )
-    random.shuffle(empty_locations)
-    random.shuffle(items_to_place)
-    for location in empty_locations:
-        if len(items_to_place) == 0:
-            break
-        location.set_current_item(items_to_place.pop())
 
 
-def place_restricted_items(world: World, worlds: list[World]) -> None:
-    fill_required_dungeon_goal_locations(world, worlds)
-    place_own_dungeon_items(world, worlds)
-    place_own_region_items(world, worlds)
-    place_any_dungeon_items(world, worlds)
-    place_overworld_items(world, worlds)
+# Remove all of item from world's item pool and add them to restricted_items,
+# restricted to only be placed at locations
+def restrict_item(
+    world: World,
+    item: Item | None,
+    locations: list[Location],
+    restricted_items: list[Item],
+    item_locations: dict[Item, list[Location]],
+) -> None:
+    if item is None:
+        return
+    restricted_items.extend([item] * world.item_pool[item])
+    world.item_pool[item] = 0
+    item_locations[item] = locations
 
 
 def fill_required_dungeon_goal_locations(world: World, worlds: list[World]):
@@ -251,79 +505,100 @@ def fill_required_dungeon_goal_locations(world: World, worlds: list[World]):
     )
 
 
-def place_own_dungeon_items(world: World, worlds: list[World]):
-    for dungeon in world.dungeons.values():
-        own_dungeon_items: list[Item] = []
+# Returns the locations in dungeon that its own dungeon items can be placed at.
+# If the dungeon is not required AND empty unrequired dungeons is on, only choose
+# non-progress locations, else choose progression locations
+def get_own_dungeon_locations(dungeon: Dungeon) -> list[Location]:
+    if dungeon.should_be_barren():
+        return [loc for loc in dungeon.locations if not loc.progression]
+    return [loc for loc in dungeon.locations if loc.progression]
 
-        if world.setting("small_keys") == "own_dungeon":
-            small_key = dungeon.small_key
-            if small_key is not None:
-                own_dungeon_items.extend([small_key] * world.item_pool[small_key])
-                world.item_pool[small_key] = 0
 
-        if world.setting("boss_keys") == "own_dungeon":
+# If we're restricting maps to not be on Heart Containers or end of dungeon
+# checks, place each dungeon's map (and own dungeon small keys) while its boss
+# key is out of the item pool to make these locations not possible to get to.
+# The boss keys are placed with the rest of the restricted items after.
+def place_own_dungeon_restricted_maps(worlds: list[World]) -> None:
+    for world in worlds:
+        if world.setting("map_mode") != "own_dungeon_restricted":
+            continue
+
+        for dungeon in world.dungeons.values():
+            restricted_items: list[Item] = []
+            item_locations: dict[Item, list[Location]] = {}
+            fill_locations = get_own_dungeon_locations(dungeon)
+            if world.setting("small_keys") == "own_dungeon":
+                restrict_item(
+                    world,
+                    dungeon.small_key,
+                    fill_locations,
+                    restricted_items,
+                    item_locations,
+                )
+            restrict_item(
+                world, dungeon.map, fill_locations, restricted_items, item_locations
+            )
+
+            # Take the boss key out of the item pool while the map is placed
             boss_key = dungeon.boss_key
-            if boss_key is not None:
-                own_dungeon_items.extend([boss_key] * world.item_pool[boss_key])
+            boss_key_count = 0
+            if world.setting("boss_keys") == "own_dungeon" and boss_key is not None:
+                boss_key_count = world.item_pool[boss_key]
                 world.item_pool[boss_key] = 0
 
-        if world.setting("map_mode").is_any_of(
-            "own_dungeon_restricted", "own_dungeon_unrestricted"
-        ):
-            map_item = dungeon.map
-            own_dungeon_items.extend([map_item] * world.item_pool[map_item])
-            world.item_pool[map_item] = 0
+            complete_item_pool = get_complete_item_pool(worlds)
+            assumed_fill(
+                worlds,
+                restricted_items,
+                complete_item_pool,
+                fill_locations,
+            )
 
-        # Get the complete item pool for all worlds incase of multiworld
-        # plandomized items that are required to get to this dungeon
-        complete_item_pool = get_complete_item_pool(worlds)
+            if boss_key_count > 0:
+                world.item_pool[boss_key] = boss_key_count
 
-        # The possible fill locations depends on if the dungeon is required and if
-        # empty unrequired dungeons is enabled or not
-        # If the dungeon is not required AND empty unrequired dungeons is on, only choose
-        # non-progress locations, else choose progression locations
-        fill_locations = []
-        if dungeon.should_be_barren():
-            fill_locations = [loc for loc in dungeon.locations if not loc.progression]
-        else:
-            fill_locations = [loc for loc in dungeon.locations if loc.progression]
-
-        # Now place the own dungeon items. If we're restricting maps
-        # to not be on Heart Containers or end of dungeon checks, remove
-        # the boss key to make these locations not possible to get to, and
-        # place the boss keys after
-        if world.setting("map_mode") == "own_dungeon_restricted":
-            boss_key = [item for item in own_dungeon_items if item.is_boss_key]
-            own_dungeon_items = [
-                item for item in own_dungeon_items if not item.is_boss_key
-            ]
-            assumed_fill(worlds, own_dungeon_items, complete_item_pool, fill_locations)
-            own_dungeon_items = boss_key
 
-        assumed_fill(worlds, own_dungeon_items, complete_item_pool, fill_locations)
+def collect_own_dungeon_items(
+    world: World,
+    restricted_items: list[Item],
+    item_locations: dict[Item, list[Location]],
+) -> None:
+    for dungeon in world.dungeons.values():
+        fill_locations = get_own_dungeon_locations(dungeon)
 
+        if world.setting("small_keys") == "own_dungeon":
+            restrict_item(
+                world,
+                dungeon.small_key,
+                fill_locations,
+                restricted_items,
+                item_locations,
+            )
 
-def place_own_region_items(world: World, worlds: list[World]):
-    for dungeon in world.dungeons.values():
-        own_region_items: list[Item] = []
-        own_region_locations: list[Location] = []
+        if world.setting("boss_keys") == "own_dungeon":
+            restrict_item(
+                world,
+                dungeon.boss_key,
+                fill_locations,
+                restricted_items,
+                item_locations,
+            )
 
-        if world.setting("small_keys") == "own_region":
-            small_key = dungeon.small_key
-            if small_key is not None:
-                own_region_items.extend([small_key] * world.item_pool[small_key])
-                world.item_pool[small_key] = 0
+        if world.setting("map_mode").is_any_of(
+            "own_dungeon_restricted", "own_dungeon_unrestricted"
+        ):
+            restrict_item(
+                world, dungeon.map, fill_locations, restricted_items, item_locations
+            )
 
-        if world.setting("boss_keys") == "own_region":
-            boss_key = dungeon.boss_key
-            if boss_key is not None:
-                own_region_items.extend([boss_key] * world.item_pool[boss_key])
-                world.item_pool[boss_key] = 0
 
-        if world.setting("map_mode") == "own_region":
-            map_item = dungeon.map
-            own_region_items.extend([map_item] * world.item_pool[map_item])
-            world.item_pool[map_item] = 0
+def collect_own_region_items(
+    world: World,
+    restricted_items: list[Item],
+    item_locations: dict[Item, list[Location]],
+) -> None:
+    for dungeon in world.dungeons.values():
+        own_region_locations: list[Location] = []
 
         # Get all locations in the dungeon and the region around the dungeon
         dungeon_regions = dungeon.starting_entrance.parent_area.hint_regions
@@ -346,16 +621,39 @@ def place_own_region_items(world: World, worlds: list[World]):
                 loc for loc in own_region_locations if loc.progression
             ]
 
-        # Get the complete item pool for all worlds incase of multiworld
-        # plandomized items that are required to get to this dungeon
-        complete_item_pool = get_complete_item_pool(worlds)
-        assumed_fill(worlds, own_region_items, complete_item_pool, own_region_locations)
+        if world.setting("small_keys") == "own_region":
+            restrict_item(
+                world,
+                dungeon.small_key,
+                own_region_locations,
+                restricted_items,
+                item_locations,
+            )
+
+        if world.setting("boss_keys") == "own_region":
+            restrict_item(
+                world,
+                dungeon.boss_key,
+                own_region_locations,
+                restricted_items,
+                item_locations,
+            )
 
+        if world.setting("map_mode") == "own_region":
+            restrict_item(
+                world,
+                dungeon.map,
+                own_region_locations,
+                restricted_items,
+                item_locations,
+            )
 
-def place_any_dungeon_items(world: World, worlds: list[World]):
-    any_dungeon_items: list[Item] = []
-    any_dungeon_locations: list[Location] = []
 
+def collect_any_dungeon_items(
+    world: World,
+    restricted_items: list[Item],
+    item_locations: dict[Item, list[Location]],
+) -> None:
     # Any dungeon items for should_be_barren dungeons will go in a separate pool
     non_barren_dungeons = [
         dungeon for dungeon in world.dungeons.values() if not dungeon.should_be_barren()
@@ -365,81 +663,94 @@ def place_any_dungeon_items(world: World, worlds: list[World]):
     ]
 
     for dungeons in [non_barren_dungeons, barren_dungeons]:
-        any_dungeon_items.clear()
-        any_dungeon_locations.clear()
+        # If a dungeon is not guaranteed barren, only get the progression locations within
+        any_dungeon_locations = [
+            loc
+            for dungeon in dungeons
+            for loc in dungeon.locations
+            if dungeon.should_be_barren() or loc.progression
+        ]
+
         for dungeon in dungeons:
             if world.setting("small_keys") == "any_dungeon":
-                small_key = dungeon.small_key
-                if small_key is not None:
-                    any_dungeon_items.extend([small_key] * world.item_pool[small_key])
-                    world.item_pool[small_key] = 0
+                restrict_item(
+                    world,
+                    dungeon.small_key,
+                    any_dungeon_locations,
+                    restricted_items,
+                    item_locations,
+                )
 
             if world.setting("boss_keys") == "any_dungeon":
-                boss_key = dungeon.boss_key
-                if boss_key is not None:
-                    any_dungeon_items.extend([boss_key] * world.item_pool[boss_key])
-                    world.item_pool[boss_key] = 0
+                restrict_item(
+                    world,
+                    dungeon.boss_key,
+                    any_dungeon_locations,
+                    restricted_items,
+                    item_locations,
+                )
 
             if world.setting("map_mode") == "any_dungeon":
-                map_item = dungeon.map
-                any_dungeon_items.extend([map_item] * world.item_pool[map_item])
-                world.item_pool[map_item] = 0
-
-            # If this dungeon is not guaranteed barren, only get the progression locations within
-            any_dungeon_locations.extend(
-                [
-                    loc
-                    for loc in dungeon.locations
-                    if dungeon.should_be_barren() or loc.progression
-                ]
-            )
-
-        # Get the complete item pool for all worlds incase of multiworld
-        # plandomized items that are required to get to this dungeon
-        complete_item_pool = get_complete_item_pool(worlds)
-        assumed_fill(
-            worlds, any_dungeon_items, complete_item_pool, any_dungeon_locations
-        )
+                restrict_item(
+                    world,
+                    dungeon.map,
+                    any_dungeon_locations,
+                    restricted_items,
+                    item_locations,
+                )
 
 
-def place_overworld_items(world: World, worlds: list[World]):
-    overworld_items: list[Item] = []
+def collect_overworld_items(
+    world: World,
+    restricted_items: list[Item],
+    item_locations: dict[Item, list[Location]],
+) -> None:
+    # Remove locations from all dungeons from the overworld locations
+    dungeon_locations = set()
+    for dungeon in world.dungeons.values():
+        dungeon_locations.update(dungeon.locations)
     overworld_locations = [
-        loc for loc in world.get_all_item_locations() if loc.progression
+        loc
+        for loc in world.get_all_item_locations()
+        if loc.progression and loc not in dungeon_locations
     ]
 
     for dungeon in world.dungeons.values():
         if world.setting("small_keys") == "overworld":
-            small_key = dungeon.small_key
-            if small_key is not None:
-                overworld_items.extend([small_key] * world.item_pool[small_key])
-                world.item_pool[small_key] = 0
+            restrict_item(
+                world,
+                dungeon.small_key,
+                overworld_locations,
+                restricted_items,
+                item_locations,
+            )
 
         if world.setting("boss_keys") == "overworld":
-            boss_key = dungeon.boss_key
-            if boss_key is not None:
-                overworld_items.extend([boss_key] * world.item_pool[boss_key])
-                world.item_pool[boss_key] = 0
+            restrict_item(
+                world,
+                dungeon.boss_key,
+                overworld_locations,
+                restricted_items,
+                item_locations,
+            )
 
         if world.setting("map_mode") == "overworld":
-            map_item = dungeon.map
-            overworld_items.extend([map_item] * world.item_pool[map_item])
-            world.item_pool[map_item] = 0
-
-        # Remove locations from this dungeon from the overworld locations
-        overworld_locations = [
-            loc for loc in overworld_locations if loc not in dungeon.locations
-        ]
+            restrict_item(
+                world,
+                dungeon.map,
+                overworld_locations,
+                restricted_items,
+                item_locations,
+            )
 
     if world.setting("lanayru_caves_keys") == "overworld":
-        caves_key = world.get_item("Lanayru Caves Small Key")
-        overworld_items.extend([caves_key] * world.item_pool[caves_key])
-        world.item_pool[caves_key] = 0
-
-    # Get the complete item pool for all worlds incase of multiworld
-    # plandomized items that are required to get to this dungeon
-    complete_item_pool = get_complete_item_pool(worlds)
-    assumed_fill(worlds, overworld_items, complete_item_pool, overworld_locations)
+        restrict_item(
+            world,
+            world.get_item("Lanayru Caves Small Key"),
+            overworld_locations,
+            restricted_items,
+            item_locations,
+        )
 
 
 # Cache all the possible times of day for each area and exit.
@@ -1,4 +1,4 @@
-from filepathconstants import DEFAULT_OUTPUT_PATH, PLANDO_PATH
+from filepathconstants import DEFAULT_OUTPUT_PATH, PLANDO_PATH, SPOILER_LOGS_PATH
 from randomizer.setting_string import setting_string_from_config
 from .world import World
 from .config import *
@@ -9,17 +9,52 @@ from .spoiler_log import generate_spoiler_log, generate_anti_spoiler_log
 from .plandomizer import load_plandomizer_data
 from .entrance_shuffle import shuffle_world_entrances
 from .hints import generate_hints
+from .profiler import reset_profiler, profile_phase
 from util.text import load_text_data
-
-from gui.dialogs.dialog_header import print_progress_text, update_progress_value
+from util.progress import print_progress_text, update_progress_value
+import argparse
+import logging
 import time
 import random
 
 
-def generate(config_file: Path) -> list[World]:
+# Options for how seeds are generated, as opposed to the config which decides
+# what they contain. Filled in by whichever entry point is generating the seed.
+class GenerationOptions:
+    def __init__(
+        self,
+        fill_workers: int = 0,
+        entrance_candidate_workers: int = 0,
+        hint_workers: int = 0,
+        spoiler_log_json: bool = False,
+        write_profile: bool = False,
+        write_spoiler_logs: bool = True,
+    ) -> None:
+        self.fill_workers = fill_workers
+        self.entrance_candidate_workers = entrance_candidate_workers
+        self.hint_workers = hint_workers
+        self.spoiler_log_json = spoiler_log_json
+        self.write_profile = write_profile
+        # Whether to write the spoiler and anti-spoiler logs for the seed
+        self.write_spoiler_logs = write_spoiler_logs
+
+    @staticmethod
+    def from_program_args(args: argparse.Namespace) -> "GenerationOptions":
+        return GenerationOptions(
+            fill_workers=args.fill_workers,
+            entrance_candidate_workers=args.entrance_candidate_workers,
+            hint_workers=args.hint_workers,
+            spoiler_log_json=args.spoiler_log_json,
+            write_profile=args.debug,
+        )
+
+
+def load_generation_data() -> None:
     get_all_settings_info()
     load_text_data()
 
+
+def load_generation_config(config_file: Path) -> Config:
     config = load_config_from_file(config_file, create_if_blank=True)
 
     if config.output_dir != DEFAULT_OUTPUT_PATH and (
@@ -31,6 +66,16 @@ The output folder you have specified cannot be found ({config.output_dir.as_posi
 Please choose a valid folder and try again."""
         )
 
+    return config
+
+
+def generate(
+    config_file: Path, options: GenerationOptions | None = None
+) -> list[World]:
+    load_generation_data()
+
+    config = load_generation_config(config_file)
+
     # If config has no seed, generate one
     if config.seed == "":
         config.seed = str(random.randint(0, 0xFFFFFFFF))
@@ -38,11 +83,43 @@ Please choose a valid folder and try again."""
 
     print_progress_text(f"Seed: {config.seed}")
 
-    return generate_randomizer(config)
+    return generate_randomizer(config, options)
 
 
-def generate_randomizer(config: Config) -> list[World]:
+# Batch seeds are used as folder names inside the output folder, so they can't
+# contain anything that would put the folder anywhere else
+def check_seed_folder_name(seed: str) -> None:
+    if seed in ("", ".") or ".." in seed or "/" in seed or "\\" in seed:
+        raise ConfigError(
+            f'Cannot use "{seed}" as a batch seed. Batch seeds are used as folder names, so they cannot be empty or contain "/", "\\" or "..".'
+        )
+
+
+# Generates the given seed with the settings from the config file. Used for
+# batches of seeds, so the setting and text data have to be loaded beforehand
+# with load_generation_data. Each seed's patch goes in its own folder inside
+# the configured output folder.
+def generate_seed(
+    config_file: Path, seed: str, options: GenerationOptions | None = None
+) -> list[World]:
+    check_seed_folder_name(seed)
+    config = load_generation_config(config_file)
+    config.seed = seed
+    config.output_dir = config.output_dir / seed
+
+    print_progress_text(f"Seed: {config.seed}")
+
+    return generate_randomizer(config, options)
+
+
+def generate_randomizer(
+    config: Config, options: GenerationOptions | None = None
+) -> list[World]:
+    if options is None:
+        options = GenerationOptions()
+
     start = time.process_time()
+    profiler = reset_profiler()
 
     seed_rng(config, resolve_non_standard_random=True, ignore_invalid_plandomizer=False)
     print(f"Hash: {config.get_hash()}")
@@ -56,12 +133,13 @@ def generate_randomizer(config: Config) -> list[World]:
         setting_map = config.settings[i]
         worlds.append(World(i))
         print_progress_text(f"Building {worlds[i]}")
-        worlds[i].setting_map = setting_map
-        worlds[i].resolve_random_settings()
-        worlds[i].resolve_conflicting_settings()
-        worlds[i].num_worlds = len(config.settings)
-        worlds[i].config = config
-        worlds[i].build()
+        with profile_phase(f"Build {worlds[i]}"):
+            worlds[i].setting_map = setting_map
+            worlds[i].resolve_random_settings()
+            worlds[i].resolve_conflicting_settings()
+            worlds[i].num_worlds = len(config.settings)
+            worlds[i].config = config
+            worlds[i].build()
 
     # Give each world a reference back to the list of all worlds
     for world in worlds:
@@ -88,7 +166,16 @@ def generate_randomizer(config: Config) -> list[World]:
     update_progress_value(4)
     for world in worlds:
         print_progress_text(f"Shuffling entrances for {world}...")
-        shuffle_world_entrances(world, worlds)
+        with profile_phase(f"Shuffle Entrances ({world})"):
+            entrance_shuffle_stats = shuffle_world_entrances(
+                world,
+                worlds,
+                workers=options.fill_workers,
+                candidate_workers=options.entrance_candidate_workers,
+            )
+        logging.getLogger("").debug(
+            f"Entrance shuffle stats for {world}: {entrance_shuffle_stats.to_dict()}"
+        )
 
     for world in worlds:
         world.perform_post_entrance_shuffle_tasks()
@@ -98,7 +185,8 @@ def generate_randomizer(config: Config) -> list[World]:
     update_progress_value(6)
     print_progress_text("Filling Worlds...")
 
-    fill_worlds(worlds)
+    with profile_phase("Fill"):
+        fill_worlds(worlds, workers=options.fill_workers)
     end = time.process_time()
     print(f"Fill took {(end - start)} seconds")
 
@@ -106,13 +194,21 @@ def generate_randomizer(config: Config) -> list[World]:
         world.perform_post_fill_tasks()
 
     update_progress_value(8)
-    generate_playthrough(worlds)
+    with profile_phase("Playthrough"):
+        generate_playthrough(worlds)
 
     update_progress_value(10)
-    generate_hints(worlds)
+    with profile_phase("Hints"):
+        generate_hints(worlds, workers=options.hint_workers)
 
     update_progress_value(12)
-    if config.generate_spoiler_log:
-        generate_spoiler_log(worlds)
-    generate_anti_spoiler_log(worlds)
+    if options.write_spoiler_logs:
+        with profile_phase("Spoiler Log"):
+            if config.generate_spoiler_log:
+                generate_spoiler_log(worlds, write_json=options.spoiler_log_json)
+            generate_anti_spoiler_log(worlds, write_json=options.spoiler_log_json)
+
+    # Write out where generation spent its time when debugging
+    if options.write_profile:
+        profiler.write_json(SPOILER_LOGS_PATH / f"{config.get_hash()} Profile.json")
     return worlds
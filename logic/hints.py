@@ -2,72 +2,202 @@ from util.text import *
 from constants.itemconstants import *
 from .world import World
 from .search import *
+from .parallel import run_parallel_tasks
 import logging
 import math
+import random
 
 
-def generate_hints(worlds: list[World]) -> None:
+class HintError(RuntimeError):
+    pass
+
+
+# Hint data for a single world which can be passed between processes.
+# Locations are referred to by their world's id and their name.
+class WorldHints:
+    def __init__(self) -> None:
+        self.hinted_locations: list[tuple[int, str]] = []
+        self.location_hints: dict[tuple[int, str], Hint] = {}
+        self.fi_hints: list[tuple[int, str]] = []
+        self.gossip_stone_hints: dict[str, list[tuple[int, str]]] = {}
+        self.song_hints: dict[str, Hint] = {}
+        self.impa_sot_hint: Hint | None = None
+
+
+def generate_hints(worlds: list[World], workers: int = 0) -> None:
     print_progress_text("Generating Hints")
     sanitize_major_items(worlds)
-    calculate_possible_path_locations(worlds)
+    calculate_possible_path_locations(worlds, workers)
     calculate_possible_barren_regions(worlds)
 
-    for world in worlds:
-        hint_locations = []
-        generate_impa_sot_hint(world)
-        generate_song_hints(world, hint_locations)
-        generate_path_hint_locations(world, hint_locations)
-        generate_barren_hint_locations(world, hint_locations)
-        generate_item_hint_locations(world, hint_locations)
-
-        # If we weren't able to generate the specified number
-        # of hints for path, barren, or item hints then make up
-        # for those with extra location hints
-        total_num_hints = (
-            world.setting("path_hints").value_as_number()
-            + world.setting("barren_hints").value_as_number()
-            + world.setting("item_hints").value_as_number()
-            + world.setting("location_hints").value_as_number()
-        )
-        total_made_hints = len(hint_locations)
-        num_location_hints = total_num_hints - total_made_hints
-        generate_location_hint_locations(world, hint_locations, num_location_hints)
-
-        # Setup each possible hint placement option
-        hint_placement_options = []
-        if world.setting("fi_hints") == "on":
-            hint_placement_options.append("fi_hints")
-        if world.setting("gossip_stone_hints") == "on":
-            hint_placement_options.append("gossip_stone_hints")
-
-        # If no placement options were selected, don't use hints
-        if not hint_placement_options:
-            continue
-
-        random.shuffle(hint_placement_options)
+    # Every world's hints are generated starting from the same state, each
+    # seeded on its own, and then applied in order. This is done the same way
+    # for any number of workers so the hints for a seed never depend on it.
+    all_world_hints = run_parallel_tasks(
+        lambda index: generate_world_hints(worlds[index], worlds), len(worlds), workers
+    )
 
-        hints_for_category = {
-            placement_option: [] for placement_option in hint_placement_options
-        }
-        # Distribute hints as evenly as possible among placement options
-        for i in range(len(hint_locations)):
-            # Iterate between the placement options on each index
-            placement_option = hint_placement_options[i % len(hint_placement_options)]
-            # Add the hint location to the selected placement option
-            hints_for_category[placement_option].append(hint_locations[i])
+    # If a world picked any locations that an earlier world already hinted at,
+    # its hints are generated again on top of the earlier worlds' hints instead.
+    # Those are seeded on their own as well, so the main RNG is left the same
+    # whether or not any worlds overlap.
+    regeneration_seed = random.getrandbits(64)
+    rng_state = random.getstate()
+    claimed_locations: set[tuple[int, str]] = set()
+    for world, world_hints in zip(worlds, all_world_hints):
+        if claimed_locations.intersection(get_world_hints_locations(world_hints)):
             logging.getLogger("").debug(
-                f'Hint for "{hint_locations[i]}" will be given to {placement_option}'
+                f"Hints for {world} overlap with earlier worlds. Generating them again."
             )
+            random.seed(f"{regeneration_seed}-{world.id}")
+            world_hints = generate_world_hints(world, worlds)
+        apply_world_hints(world, worlds, world_hints)
+        claimed_locations.update(get_world_hints_locations(world_hints))
+    random.setstate(rng_state)
 
-        if (
-            "gossip_stone_hints" in hints_for_category
-            and hints_for_category["gossip_stone_hints"]
-        ):
-            assign_gossip_stone_hints(
-                world, worlds, hints_for_category["gossip_stone_hints"]
-            )
-        if "fi_hints" in hints_for_category:
-            world.fi_hints = hints_for_category["fi_hints"]
+
+def get_location_key(location: Location) -> tuple[int, str]:
+    return (location.world.id, location.name)
+
+
+def get_location_from_key(worlds: list[World], key: tuple[int, str]) -> Location:
+    return worlds[key[0]].get_location(key[1])
+
+
+def copy_hint(hint: Hint) -> Hint:
+    hint_copy = Hint()
+    hint_copy.type = hint.type
+    hint_copy.text = hint.text
+    return hint_copy
+
+
+# Generates the hints for a single world and returns them without
+# leaving any changes to the hint state of the locations behind
+def generate_world_hints(world: World, worlds: list[World]) -> WorldHints:
+    all_locations = [location for w in worlds for location in w.location_table.values()]
+    location_states = {
+        location: (location.is_hinted, location.hint.type, location.hint.text)
+        for location in all_locations
+    }
+    # Path hints shuffle the world's path locations in place
+    path_locations = {
+        goal_location: locations.copy()
+        for goal_location, locations in world.path_locations.items()
+    }
+
+    try:
+        generate_world_hint_locations(world, worlds)
+
+        world_hints = WorldHints()
+        for location in all_locations:
+            is_hinted, hint_type, hint_text = location_states[location]
+            if location.is_hinted and not is_hinted:
+                world_hints.hinted_locations.append(get_location_key(location))
+            if location.hint.type != hint_type or location.hint.text is not hint_text:
+                world_hints.location_hints[get_location_key(location)] = copy_hint(
+                    location.hint
+                )
+        world_hints.fi_hints = [get_location_key(loc) for loc in world.fi_hints]
+        world_hints.gossip_stone_hints = {
+            stone.name: [get_location_key(loc) for loc in hint_locations]
+            for stone, hint_locations in world.gossip_stone_hints.items()
+        }
+        world_hints.song_hints = {
+            song.name: hint for song, hint in world.song_hints.items()
+        }
+        world_hints.impa_sot_hint = world.impa_sot_hint
+        return world_hints
+    finally:
+        for location, (is_hinted, hint_type, hint_text) in location_states.items():
+            location.is_hinted = is_hinted
+            location.hint.type = hint_type
+            location.hint.text = hint_text
+        world.path_locations = path_locations
+
+
+# All the locations whose hint state the world's hints change
+def get_world_hints_locations(world_hints: WorldHints) -> set[tuple[int, str]]:
+    return set(world_hints.hinted_locations) | set(world_hints.location_hints)
+
+
+def apply_world_hints(
+    world: World, worlds: list[World], world_hints: WorldHints
+) -> None:
+    for key in world_hints.hinted_locations:
+        get_location_from_key(worlds, key).is_hinted = True
+    for key, hint in world_hints.location_hints.items():
+        get_location_from_key(worlds, key).hint = hint
+    world.fi_hints = [
+        get_location_from_key(worlds, key) for key in world_hints.fi_hints
+    ]
+    world.gossip_stone_hints.clear()
+    for stone_name, keys in world_hints.gossip_stone_hints.items():
+        world.gossip_stone_hints[world.get_location(stone_name)] = [
+            get_location_from_key(worlds, key) for key in keys
+        ]
+    world.song_hints = {
+        world.get_item(song_name): hint
+        for song_name, hint in world_hints.song_hints.items()
+    }
+    world.impa_sot_hint = world_hints.impa_sot_hint
+
+
+def generate_world_hint_locations(world: World, worlds: list[World]) -> None:
+    hint_locations = []
+    generate_impa_sot_hint(world)
+    generate_song_hints(world, hint_locations)
+    generate_path_hint_locations(world, hint_locations)
+    generate_barren_hint_locations(world, hint_locations)
+    generate_item_hint_locations(world, hint_locations)
+
+    # If we weren't able to generate the specified number
+    # of hints for path, barren, or item hints then make up
+    # for those with extra location hints
+    total_num_hints = (
+        world.setting("path_hints").value_as_number()
+        + world.setting("barren_hints").value_as_number()
+        + world.setting("item_hints").value_as_number()
+        + world.setting("location_hints").value_as_number()
+    )
+    total_made_hints = len(hint_locations)
+    num_location_hints = total_num_hints - total_made_hints
+    generate_location_hint_locations(world, hint_locations, num_location_hints)
+
+    # Setup each possible hint placement option
+    hint_placement_options = []
+    if world.setting("fi_hints") == "on":
+        hint_placement_options.append("fi_hints")
+    if world.setting("gossip_stone_hints") == "on":
+        hint_placement_options.append("gossip_stone_hints")
+
+    # If no placement options were selected, don't use hints
+    if not hint_placement_options:
+        return
+
+    random.shuffle(hint_placement_options)
+
+    hints_for_category = {
+        placement_option: [] for placement_option in hint_placement_options
+    }
+    # Distribute hints as evenly as possible among placement options
+    for i in range(len(hint_locations)):
+        # Iterate between the placement options on each index
+        placement_option = hint_placement_options[i % len(hint_placement_options)]
+        # Add the hint location to the selected placement option
+        hints_for_category[placement_option].append(hint_locations[i])
+        logging.getLogger("").debug(
+            f'Hint for "{hint_locations[i]}" will be given to {placement_option}'
+        )
+
+    if (
+        "gossip_stone_hints" in hints_for_category
+        and hints_for_category["gossip_stone_hints"]
+    ):
+        assign_gossip_stone_hints(
+            world, worlds, hints_for_category["gossip_stone_hints"]
+        )
+    if "fi_hints" in hints_for_category:
+        world.fi_hints = hints_for_category["fi_hints"]
 
 
 # Set some items as non-major depending on certain conditions.
@@ -127,7 +257,7 @@ def sanitize_major_items(worlds: list[World]) -> None:
                 )
 
 
-def calculate_possible_path_locations(worlds: list[World]) -> None:
+def calculate_possible_path_locations(worlds: list[World], workers: int = 0) -> None:
     logging.getLogger("").debug("Generating Path Locations")
     # First generate the goal location keys and also remove items from non-
     # progress locations since they shouldn't be considered when determining
@@ -149,73 +279,98 @@ def calculate_possible_path_locations(worlds: list[World]) -> None:
                 non_required_locations[location] = location.current_item
                 location.remove_current_item()
 
-    # Determine path locations for each goal location by going through the playthrough
-    # and seeing if taking away the item at each location can still access the goal location(s)
-    for world in worlds:
-        for sphere in worlds[0].playthrough_spheres:
-            for location in sphere:
-                item_at_location = location.current_item
-
-                # TODO: how can an item_at_location even be null here?
-                if item_at_location is None:
-                    continue
-
-                # If this location has a small or big key and the key is known to be within the dungeon,
-                # then ignore it because the player already knows where those items are. Also ignore race
-                # mode locations at the end of dungeons because players know those locations are required.
-                if (
-                    location.has_known_vanilla_item
-                    or location.is_goal_location
-                    or (
-                        item_at_location.is_dungeon_small_key
-                        and world.setting("small_keys").is_any_of(
-                            "own_dungeon", "own_region"
-                        )
+    # Each world's path locations only depend on its own goal locations, so
+    # the worlds can be done in parallel
+    all_path_locations = run_parallel_tasks(
+        lambda index: get_world_path_locations(worlds[index], worlds),
+        len(worlds),
+        workers,
+    )
+    for world, path_locations in zip(worlds, all_path_locations):
+        world.path_locations = {
+            world.get_location(goal_name): [
+                get_location_from_key(worlds, key) for key in keys
+            ]
+            for goal_name, keys in path_locations.items()
+        }
+
+    # Give back non-progress items
+    for location, item in non_required_locations.items():
+        location.set_current_item(item)
+
+
+# Finds the path locations for each of the world's goal locations by going through the
+# playthrough and seeing if taking away the item at each location can still access the
+# goal location(s). Returns them by goal location name for the caller to apply.
+def get_world_path_locations(
+    world: World, worlds: list[World]
+) -> dict[str, list[tuple[int, str]]]:
+    world_path_locations: dict[Location, list[Location]] = {
+        goal_location: [] for goal_location in world.path_locations
+    }
+    for sphere in worlds[0].playthrough_spheres:
+        for location in sphere:
+            item_at_location = location.current_item
+
+            # TODO: how can an item_at_location even be null here?
+            if item_at_location is None:
+                continue
+
+            # If this location has a small or big key and the key is known to be within the dungeon,
+            # then ignore it because the player already knows where those items are. Also ignore race
+            # mode locations at the end of dungeons because players know those locations are required.
+            if (
+                location.has_known_vanilla_item
+                or location.is_goal_location
+                or (
+                    item_at_location.is_dungeon_small_key
+                    and world.setting("small_keys").is_any_of(
+                        "own_dungeon", "own_region"
                     )
-                    or (
-                        item_at_location.is_boss_key
-                        and world.setting("boss_keys").is_any_of(
-                            "own_dungeon", "own_region"
-                        )
+                )
+                or (
+                    item_at_location.is_boss_key
+                    and world.setting("boss_keys").is_any_of(
+                        "own_dungeon", "own_region"
                     )
-                ):
-                    continue
-
-                # Take the item away from the location
-                location.remove_current_item()
+                )
+            ):
+                continue
 
-                # Run a search without the item
-                search = Search(SearchMode.ACCESSIBLE_LOCATIONS, worlds)
-                search.search_worlds()
+            # Take the item away from the location
+            location.remove_current_item()
 
-                # If we never reach the goal location, then this location is
-                # "on the path to" the goal location.
-                for goal_location, path_locations in world.path_locations.items():
-                    if goal_location not in search.visited_locations:
-                        path_locations.append(location)
+            # Run a search without the item
+            search = Search(SearchMode.ACCESSIBLE_LOCATIONS, worlds)
+            search.search_worlds()
 
-                # Then give back the location's item
-                location.set_current_item(item_at_location)
+            # If we never reach the goal location, then this location is
+            # "on the path to" the goal location.
+            for goal_location, path_locations in world_path_locations.items():
+                if goal_location not in search.visited_locations:
+                    path_locations.append(location)
 
-        # logging.getLogger("").debug(f"Path locations for {world}")
-        # for goal_location, path_locations in world.path_locations.items():
-        #     goal_name = get_text_data(goal_location.name, "goal_name").get(
-        #         "en_US"
-        #     )
-        #     logging.getLogger("").debug(f"  {goal_name}")
-        #     for location in path_locations:
-        #         logging.getLogger("").debug(f"  - {location}: {location.current_item}")
+            # Then give back the location's item
+            location.set_current_item(item_at_location)
 
-    # Give back non-progress items
-    for location, item in non_required_locations.items():
-        location.set_current_item(item)
+    # logging.getLogger("").debug(f"Path locations for {world}")
+    # for goal_location, path_locations in world_path_locations.items():
+    #     goal_name = get_text_data(goal_location.name, "goal_name").get(
+    #         "en_US"
+    #     )
+    #     logging.getLogger("").debug(f"  {goal_name}")
+    #     for location in path_locations:
+    #         logging.getLogger("").debug(f"  - {location}: {location.current_item}")
+
+    return {
+        goal_location.name: [get_location_key(location) for location in path_locations]
+        for goal_location, path_locations in world_path_locations.items()
+    }
 
 
 def calculate_possible_barren_regions(worlds: list[World]) -> None:
     logging.getLogger("").debug("Calculating Barren Regions")
     for world in worlds:
-        potentially_junk_locations = set()
-        junk_locations = set()
         for location in world.get_all_item_locations():
             # If this location is progression, then add its hint regions to
             # the set of potentially barren regions
@@ -224,67 +379,33 @@ def calculate_possible_barren_regions(worlds: list[World]) -> None:
                     for hint_region in loc_access.area.hint_regions:
                         world.barren_regions[hint_region] = []
 
-            # Prevent small keys and big keys in known places from being barren blockers
-            item_at_location = location.current_item
-            if (
-                location.is_goal_location
-                or (
-                    item_at_location.is_dungeon_small_key
-                    and world.setting("small_keys").is_any_of("vanilla", "own_dungeon")
-                )
-                or (
-                    item_at_location.is_boss_key
-                    and world.setting("boss_keys").is_any_of("vanilla", "own_dungeon")
-                )
-            ):
-                junk_locations.add(location)
-            # Depending on how items were placed, temporarily set certain
-            # items as junk items if all of the item's chain locations also
-            # only contain junk
-            chain_locations = [
-                world.get_location(loc_name)
-                for loc_name in location.current_item.chain_locations
-            ]
-            if location.progression and len(chain_locations) > 0:
-                if locations_are_all_junk(chain_locations):
-                    junk_locations.add(location)
-                    logging.getLogger("").debug(f"{location.current_item} is now junk")
-                else:
-                    potentially_junk_locations.add(location)
-
-        # Iterate through all the potentially_junk_locations until
-        # no new junk locations are set
-        new_junk_locations = True
-        while new_junk_locations:
-            new_junk_locations = False
-            for location in potentially_junk_locations:
-                chain_locations = [
-                    world.get_location(loc_name)
-                    for loc_name in location.current_item.chain_locations
-                ]
-                if location.current_item.is_major_item and locations_are_all_junk(
-                    chain_locations
-                ):
-                    new_junk_locations = True
-                    junk_locations.add(location)
-                    logging.getLogger("").debug(f"{location.current_item} is now junk")
-
-        # Now loop through all the progression locations again and remove
-        # any regions from the barren regions which have non-junk items at
-        # any of their locations. Otherwise add the location to the list
-        # of locations in the barren region
+        junk_locations = get_junk_locations(world)
+
+        # Now go through all the locations in each hint region and remove any
+        # regions from the barren regions which have non-junk items at any of
+        # their locations. Otherwise keep the region's list of locations
+        region_locations: dict[str, list[Location]] = {}
+        non_barren_regions: set[str] = set()
         for location in world.get_all_item_locations():
+            is_barren_blocker = (
+                location.progression
+                and location.current_item.is_major_item
+                and location not in junk_locations
+            )
             for loc_access in location.loc_access_list:
                 for hint_region in loc_access.area.hint_regions:
-                    if (
-                        location.progression
-                        and location.current_item.is_major_item
-                        and location not in junk_locations
-                        and hint_region in world.barren_regions
-                    ):
-                        del world.barren_regions[hint_region]
-                    elif hint_region in world.barren_regions:
-                        world.barren_regions[hint_region].append(location)
+                    if is_barren_blocker:
+                        non_barren_regions.add(hint_region)
+                    else:
+                        region_locations.setdefault(hint_region, []).append(location)
+
+        for hint_region in list(world.barren_regions.keys()):
+            if hint_region in non_barren_regions:
+                del world.barren_regions[hint_region]
+            else:
+                world.barren_regions[hint_region] = region_locations.get(
+                    hint_region, []
+                )
 
         logging.getLogger("").debug(f"Barren regions for {world}")
         for region in world.barren_regions.keys():
@@ -571,6 +692,88 @@ def generate_location_hint_message(location: Location) -> None:
     )
 
 
+# For each of the given locations, find which of the target locations (or all
+# locations if none are given) can still be reached without the location's item.
+# Each location is only searched for once. When there are targets, a single search
+# with every item shows when each location is reached. Searches are deterministic,
+# so removing an item which only gets collected after the last target has been
+# reached can't change which targets are reached and doesn't need its own search.
+def get_reachable_locations_without_items(
+    worlds: list[World],
+    locations: list[Location],
+    target_locations: list[Location] | None = None,
+) -> dict[Location, set[Location]]:
+    all_reachable_targets: set[Location] = set()
+    location_iterations: dict[Location, int] = {}
+    last_target_iteration = -1
+    if target_locations is not None:
+        search = Search(SearchMode.ACCESSIBLE_LOCATIONS, worlds)
+        search.location_iterations = location_iterations
+        search.search_worlds()
+        all_reachable_targets = search.visited_locations.intersection(target_locations)
+        last_target_iteration = max(
+            [location_iterations[target] for target in all_reachable_targets],
+            default=-1,
+        )
+
+    reachable_targets: dict[Location, set[Location]] = {}
+    for location in locations:
+        if location in reachable_targets:
+            continue
+        if target_locations is not None and (
+            location.is_empty()
+            or location not in location_iterations
+            or location_iterations[location] > last_target_iteration
+        ):
+            reachable_targets[location] = all_reachable_targets
+            continue
+
+        # Remove this item from the world and see which targets
+        # are still reachable
+        item_at_location = location.current_item
+        location.remove_current_item()
+        location_search = Search(SearchMode.ACCESSIBLE_LOCATIONS, worlds)
+        location_search.search_worlds()
+        if target_locations is None:
+            reachable_targets[location] = location_search.visited_locations
+        else:
+            reachable_targets[location] = (
+                location_search.visited_locations.intersection(all_reachable_targets)
+            )
+        location.set_current_item(item_at_location)
+
+    return reachable_targets
+
+
+# Whether each hint can be given to one of the stones reachable without its
+# item, with no stone getting more than hints_per_stone hints. Found by
+# looking for an augmenting path for each hint in turn.
+def gossip_stone_hints_can_be_placed(
+    hint_locations: list[Location],
+    reachable_stones: dict[Location, set[Location]],
+    hints_per_stone: int,
+) -> bool:
+    stone_hints: dict[Location, list[int]] = {}
+
+    def try_place(hint_index: int, checked_stones: set[Location]) -> bool:
+        for stone in reachable_stones[hint_locations[hint_index]]:
+            if stone in checked_stones:
+                continue
+            checked_stones.add(stone)
+            placed_hints = stone_hints.setdefault(stone, [])
+            if len(placed_hints) < hints_per_stone:
+                placed_hints.append(hint_index)
+                return True
+            # Try moving one of this stone's hints to a different stone
+            for i, other_hint_index in enumerate(placed_hints):
+                if try_place(other_hint_index, checked_stones):
+                    placed_hints[i] = hint_index
+                    return True
+        return False
+
+    return all(try_place(i, set()) for i in range(len(hint_locations)))
+
+
 def assign_gossip_stone_hints(
     world: World, worlds: list[World], hint_locations: list[Location]
 ) -> None:
@@ -580,6 +783,18 @@ def assign_gossip_stone_hints(
     gossip_stone_locations = world.get_gossip_stones()
     hints_per_stone = math.ceil(len(hint_locations) / len(gossip_stone_locations))
 
+    # Which stones each hint can go on doesn't change between attempts,
+    # so find them all up front
+    reachable_stones = get_reachable_locations_without_items(
+        worlds, hint_locations, gossip_stone_locations
+    )
+    if not gossip_stone_hints_can_be_placed(
+        hint_locations, reachable_stones, hints_per_stone
+    ):
+        raise HintError(
+            f"Not all hints can be placed on gossip stones reachable without the hinted items for {world}"
+        )
+
     # Keep trying to place hints until all have been logically placed
     # at least once
     successfully_placed_hints = False
@@ -590,18 +805,11 @@ def assign_gossip_stone_hints(
             world.gossip_stone_hints[stone] = []
 
         for location in hint_locations:
-            # Remove this item from the world and see which gossip stones
-            # are available to place hints
-            item_at_location = location.current_item
-            location.remove_current_item()
-
             # Get all available gossip stones for this hint.
-            search = Search(SearchMode.ACCESSIBLE_LOCATIONS, worlds)
-            search.search_worlds()
             available_gossip_stones = [
                 stone
                 for stone in gossip_stone_locations
-                if stone in search.visited_locations
+                if stone in reachable_stones[location]
                 and len(world.gossip_stone_hints[stone]) < hints_per_stone
             ]
 
@@ -609,7 +817,6 @@ def assign_gossip_stone_hints(
                 logging.getLogger("").debug(
                     f"No available stones to place hint for {location}"
                 )
-                location.set_current_item(item_at_location)
                 successfully_placed_hints = False
                 break
 
@@ -618,8 +825,6 @@ def assign_gossip_stone_hints(
             world.gossip_stone_hints[gossip_stone].append(location)
             logging.getLogger("").debug(f'"{gossip_stone}" now hints to {location}')
 
-            location.set_current_item(item_at_location)
-
     # Once we've placed every hint at least once, duplicate hints
     # and place them randomly until all gossip stones have the
     # necessary number of hints. Don't check for logic here since
@@ -747,6 +952,17 @@ def generate_song_hints(world: World, hint_locations: list[Location]) -> None:
             trial_gate_locations[song].append(loc_access.location)
             loc_access.location.is_hinted = True
 
+    # For direct hints, find the most useful item in every silent realm up front
+    most_useful_locations: dict[Item, Location] = {}
+    if world.setting("song_hints") == "direct":
+        most_useful_locations = get_most_useful_locations(
+            world.worlds,
+            {
+                song: [loc for loc in locations if loc.current_item.is_major_item]
+                for song, locations in trial_gate_locations.items()
+            },
+        )
+
     # Generate hint text depending on setting and what items are in the silent realm
     for song, locations in trial_gate_locations.items():
         world.song_hints[song] = Hint()
@@ -786,32 +1002,9 @@ def generate_song_hints(world: World, hint_locations: list[Location]) -> None:
                 if not useful_locations:
                     hint.text = get_text_data("Trial Direct Nothing")
                 else:
-                    # There's only enough text space to hint at one full item name, so calculate which item
-                    # is the most logically useful among the set and display that item name. The most logically
-                    # useful item is whichever item blocks the most checks.
-                    most_useful_location = None
-                    # Keep track of the least amount of locations unlocked so far
-                    unlocked_locations = len(world.location_table) + 1
-                    for location in useful_locations:
-                        item_at_location = location.current_item
-                        location.remove_current_item()
-
-                        search = Search(SearchMode.ACCESSIBLE_LOCATIONS, world.worlds)
-                        search.search_worlds()
-                        # If removing the item at this location leads to fewer unlocked
-                        # locations, then it's the most logically useful
-                        visisted_progression_locations = [
-                            loc for loc in search.visited_locations if loc.progression
-                        ]
-                        if (
-                            len(visisted_progression_locations) < unlocked_locations
-                            or most_useful_location is None
-                        ):
-                            most_useful_location = location
-                            unlocked_locations = len(visisted_progression_locations)
-
-                        location.set_current_item(item_at_location)
-
+                    # There's only enough text space to hint at one full item name, so
+                    # display the name of the most logically useful item among the set
+                    most_useful_location = most_useful_locations[song]
                     first_item_text = get_text_data(
                         f"{most_useful_location.current_item.name}", "pretty"
                     ).apply_text_color("r")
@@ -835,6 +1028,126 @@ def generate_song_hints(world: World, hint_locations: list[Location]) -> None:
         logging.getLogger("").debug(f'Generated hint "{hint.text}" for song {song}')
 
 
+def count_progression_locations(locations: set[Location]) -> int:
+    return len([loc for loc in locations if loc.progression])
+
+
+# Returns the location of the most logically useful item in each silent realm,
+# which is whichever item blocks the most progression locations. Silent realms
+# with a single useful item don't have anything to compare it to, so only the
+# silent realms with more than one useful item need to search without each one.
+def get_most_useful_locations(
+    worlds: list[World], useful_locations: dict[Item, list[Location]]
+) -> dict[Item, Location]:
+    contested_songs = [
+        song for song, locations in useful_locations.items() if len(locations) > 1
+    ]
+    reachable_locations = get_reachable_locations_without_items(
+        worlds, [loc for song in contested_songs for loc in useful_locations[song]]
+    )
+
+    most_useful_locations = {
+        song: locations[0] for song, locations in useful_locations.items() if locations
+    }
+    for song in contested_songs:
+        # Keep track of the least amount of locations unlocked so far
+        unlocked_locations = count_progression_locations(
+            reachable_locations[most_useful_locations[song]]
+        )
+        for location in useful_locations[song][1:]:
+            # If removing the item at this location leads to fewer unlocked
+            # locations, then it's the most logically useful
+            location_unlocked_locations = count_progression_locations(
+                reachable_locations[location]
+            )
+            if location_unlocked_locations < unlocked_locations:
+                most_useful_locations[song] = location
+                unlocked_locations = location_unlocked_locations
+
+    return most_useful_locations
+
+
+# Returns the locations which are junk from the start, along with each
+# potentially junk location and its item's chain locations
+def get_initial_junk_locations(
+    world: World,
+) -> tuple[set[Location], list[tuple[Location, list[Location]]]]:
+    junk_locations = set()
+    potentially_junk_locations = []
+    for location in world.get_all_item_locations():
+        # Prevent small keys and big keys in known places from being barren blockers
+        item_at_location = location.current_item
+        if (
+            location.is_goal_location
+            or (
+                item_at_location.is_dungeon_small_key
+                and world.setting("small_keys").is_any_of("vanilla", "own_dungeon")
+            )
+            or (
+                item_at_location.is_boss_key
+                and world.setting("boss_keys").is_any_of("vanilla", "own_dungeon")
+            )
+        ):
+            junk_locations.add(location)
+        # Depending on how items were placed, temporarily set certain
+        # items as junk items if all of the item's chain locations also
+        # only contain junk
+        chain_locations = [
+            world.get_location(loc_name)
+            for loc_name in location.current_item.chain_locations
+        ]
+        if location.progression and len(chain_locations) > 0:
+            if locations_are_all_junk(chain_locations):
+                junk_locations.add(location)
+                logging.getLogger("").debug(f"{location.current_item} is now junk")
+            else:
+                potentially_junk_locations.append((location, chain_locations))
+    return junk_locations, potentially_junk_locations
+
+
+def get_junk_locations(world: World) -> set[Location]:
+    junk_locations, potentially_junk_locations = get_initial_junk_locations(world)
+
+    # Maps each chain location to the potentially junk locations whose items
+    # lead to it, and each potentially junk location to how many of its
+    # chain locations still have a major item that isn't junk
+    chained_from: dict[Location, list[Location]] = {}
+    non_junk_chain_counts: dict[Location, int] = {}
+    new_junk_locations = list(junk_locations)
+    for location, chain_locations in potentially_junk_locations:
+        if location in junk_locations:
+            continue
+        non_junk_chain_counts[location] = 0
+        for chain_location in chain_locations:
+            if (
+                chain_location.current_item.is_major_item
+                and chain_location not in junk_locations
+            ):
+                non_junk_chain_counts[location] += 1
+                chained_from.setdefault(chain_location, []).append(location)
+        if non_junk_chain_counts[location] == 0 and location.current_item.is_major_item:
+            junk_locations.add(location)
+            new_junk_locations.append(location)
+            logging.getLogger("").debug(f"{location.current_item} is now junk")
+
+    # Items only leading to locations with junk are junk themselves, so
+    # each location which becomes junk can make the potentially junk
+    # locations chaining to it junk as well
+    while new_junk_locations:
+        junk_location = new_junk_locations.pop()
+        for location in chained_from.get(junk_location, []):
+            non_junk_chain_counts[location] -= 1
+            if (
+                non_junk_chain_counts[location] == 0
+                and location.current_item.is_major_item
+                and location not in junk_locations
+            ):
+                junk_locations.add(location)
+                new_junk_locations.append(location)
+                logging.getLogger("").debug(f"{location.current_item} is now junk")
+    return junk_locations
+
+
 def locations_are_all_junk(locations: list[Location]) -> None:
     return all([not loc.current_item.is_major_item for loc in locations])
 
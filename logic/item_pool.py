@@ -2,6 +2,8 @@ from constants.itemconstants import *
 from .settings import *
 from .item import *
 
+from collections.abc import Mapping
+from itertools import repeat
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -148,11 +150,41 @@ def get_random_junk_item_name() -> str:
     return random_junk_item
 
 
+# Read-only view of the items in every passed in world's item pool, as counts.
+# Items only ever appear in their own world's item pool, so counts can be looked
+# up directly in that pool instead of copying every pool into one list. The view
+# always reflects the current contents of the pools.
+class CompleteItemPool(Mapping):
+    def __init__(self, worlds: list["World"]) -> None:
+        self.worlds: list["World"] = worlds
+
+    def __getitem__(self, item: Item) -> int:
+        if item.world not in self.worlds:
+            return 0
+        return max(item.world.item_pool[item], 0)
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, Item) and self[item] > 0
+
+    def __iter__(self):
+        for world in self.worlds:
+            for item, count in world.item_pool.items():
+                if count > 0:
+                    yield item
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def total(self) -> int:
+        return sum(self[item] for item in self)
+
+    # Iterate over every item as many times as it appears in the pools
+    def elements(self):
+        for item in self:
+            yield from repeat(item, self[item])
+
+
 # Returns the complete item pool for all worlds in the passed
 # in world list
-def get_complete_item_pool(worlds: list["World"]) -> list[Item]:
-    complete_item_pool: list[Item] = []
-    for world in worlds:
-        for item, count in world.item_pool.items():
-            complete_item_pool.extend([item] * count)
-    return complete_item_pool
+def get_complete_item_pool(worlds: list["World"]) -> CompleteItemPool:
+    return CompleteItemPool(worlds)
@@ -11,9 +11,21 @@ if TYPE_CHECKING:
     from .world import World
 
 
+# The parsed location data is shared by every location table that gets
+# built, so it's only parsed once per process and must never be modified
+_location_data: list[dict] | None = None
+
+
+def get_location_data() -> list[dict]:
+    global _location_data
+    if _location_data is None:
+        _location_data = yaml_load(LOCATIONS_PATH)
+    return _location_data
+
+
 def build_location_table(world: "World | None" = None) -> dict[str, Location]:
     logging.getLogger("").debug(f"Building Location Table for {world}")
-    location_data = yaml_load(LOCATIONS_PATH)
+    location_data = get_location_data()
     location_id_counter = 0
 
     location_table: dict[str, Location] = {}
@@ -0,0 +1,127 @@
+from typing import Callable, TypeVar
+import multiprocessing as mp
+import random
+import sys
+
+T = TypeVar("T")
+
+# The attempt function currently being run by run_speculative_attempts.
+# Worker processes are forked after this is set, so they inherit it
+# (along with the current state of every world) without anything
+# having to be pickled.
+_current_attempt: Callable[[int], T | None] = None  # type: ignore
+_current_base_seed: int = 0
+# The task function currently being run by run_parallel_tasks
+_current_task: Callable[[int], T] = None  # type: ignore
+
+
+# Whether the warning about fork being unavailable has been shown yet
+_fork_warning_shown: bool = False
+
+
+# Pool workers are daemonic and can't start processes of their own
+def can_fork() -> bool:
+    return "fork" in mp.get_all_start_methods() and not mp.current_process().daemon
+
+
+# Whether work that was asked to be spread over worker processes can be. Workers
+# are forked so they inherit the worlds without anything having to be pickled.
+# Without fork (e.g. on Windows) the work is run serially instead, which gives
+# the same results but isn't what was asked for, so a warning is shown.
+def can_fork_workers() -> bool:
+    global _fork_warning_shown
+
+    if "fork" not in mp.get_all_start_methods():
+        if not _fork_warning_shown:
+            _fork_warning_shown = True
+            print(
+                f"WARNING: Worker processes need the fork start method, which isn't available on {sys.platform}. Running everything in a single process instead."
+            )
+        return False
+    return can_fork()
+
+
+def _run_attempt(index: int):
+    # Seed each attempt from the main seed and the attempt index so that
+    # every attempt plays out the same way no matter which process runs it
+    random.seed(f"{_current_base_seed}-{index}")
+    return _current_attempt(index)
+
+
+# Runs attempt(0), attempt(1), ... until one of them succeeds (returns something
+# other than None) and returns the index and result of the lowest index successful
+# attempt, or None if all num_attempts fail. With more than one worker, attempts
+# are run in batches of that size in parallel worker processes. Attempts must leave
+# the worlds as they found them, and return a picklable description of their result
+# for the caller to apply.
+#
+# Since each attempt is seeded on its own and the lowest index success is always
+# chosen, the outcome only depends on the current RNG state and not on the number
+# of workers or the order the attempts finish in. Only a single value is drawn from
+# the main RNG.
+def run_speculative_attempts(
+    attempt: Callable[[int], T | None], num_attempts: int, workers: int
+) -> tuple[int, T] | None:
+    global _current_attempt, _current_base_seed
+
+    _current_attempt = attempt
+    _current_base_seed = random.getrandbits(64)
+    rng_state = random.getstate()
+
+    if workers > 1 and not can_fork_workers():
+        workers = 1
+
+    try:
+        if workers <= 1:
+            for index in range(num_attempts):
+                result = _run_attempt(index)
+                if result is not None:
+                    return index, result
+            return None
+
+        with mp.get_context("fork").Pool(workers) as pool:
+            for batch_start in range(0, num_attempts, workers):
+                indices = range(batch_start, min(batch_start + workers, num_attempts))
+                for index, result in zip(indices, pool.map(_run_attempt, indices)):
+                    if result is not None:
+                        return index, result
+        return None
+    finally:
+        # Don't let the attempts affect the main RNG
+        random.setstate(rng_state)
+        _current_attempt = None  # type: ignore
+
+
+def _run_task(index: int):
+    random.seed(f"{_current_base_seed}-{index}")
+    return _current_task(index)
+
+
+# Runs task(0), task(1), ..., task(num_tasks - 1) and returns their results in
+# order. With more than one worker, the tasks are spread over that many worker
+# processes. Like attempts, tasks must leave the worlds as they found them and
+# return a picklable description of their result for the caller to apply.
+#
+# Each task is seeded on its own from a single value drawn from the main RNG,
+# so the results are the same no matter how many workers are used.
+def run_parallel_tasks(
+    task: Callable[[int], T], num_tasks: int, workers: int
+) -> list[T]:
+    global _current_task, _current_base_seed
+
+    _current_task = task
+    _current_base_seed = random.getrandbits(64)
+    rng_state = random.getstate()
+
+    if workers > 1 and not can_fork_workers():
+        workers = 1
+
+    try:
+        if workers <= 1 or num_tasks <= 1:
+            return [_run_task(index) for index in range(num_tasks)]
+
+        with mp.get_context("fork").Pool(min(workers, num_tasks)) as pool:
+            return pool.map(_run_task, range(num_tasks))
+    finally:
+        random.setstate(rng_state)
+        _current_task = None  # type: ignore
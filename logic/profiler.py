@@ -0,0 +1,99 @@
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import json
+import os
+import time
+
+
+# Counters reported for every profiled phase, even if they stay at 0
+SEARCHES: str = "searches"
+REQUIREMENT_EVALUATIONS: str = "requirement_evaluations"
+RETRIES: str = "retries"
+BACKTRACKS: str = "backtracks"
+DEFAULT_COUNTERS: list[str] = [SEARCHES, REQUIREMENT_EVALUATIONS, RETRIES, BACKTRACKS]
+
+
+class PhaseProfile:
+    def __init__(self, name: str, depth: int) -> None:
+        self.name: str = name
+        self.depth: int = depth
+        self.wall_time: float = 0.0
+        self.cpu_time: float = 0.0
+        self.counters: Counter[str] = Counter()
+
+    def to_dict(self) -> dict:
+        counters = {counter: 0 for counter in DEFAULT_COUNTERS}
+        counters.update(sorted(self.counters.items()))
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            "counters": counters,
+        }
+
+
+# Records how much time and work each phase of seed generation takes.
+# Phases can be nested, in which case the outer phase also includes
+# everything done by the inner ones. Counters are only collected in
+# the main process, so work done by fill worker processes is not counted.
+class Profiler:
+    def __init__(self) -> None:
+        self.phases: list[PhaseProfile] = []
+        self.counters: Counter[str] = Counter()
+        self.depth: int = 0
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] += amount
+
+    @contextmanager
+    def phase(self, name: str):
+        profile = PhaseProfile(name, self.depth)
+        # Add the phase now so phases stay in the order they were started in
+        self.phases.append(profile)
+        counters_at_start = self.counters.copy()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        self.depth += 1
+        try:
+            yield profile
+        finally:
+            self.depth -= 1
+            profile.wall_time = time.perf_counter() - wall_start
+            profile.cpu_time = time.process_time() - cpu_start
+            profile.counters = self.counters - counters_at_start
+
+    def to_dict(self) -> dict:
+        return {
+            "phases": [phase.to_dict() for phase in self.phases],
+            "totals": dict(sorted(self.counters.items())),
+        }
+
+    def write_json(self, filepath: Path | str) -> None:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "w", encoding="utf-8") as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=2)
+
+
+_profiler: Profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    return _profiler
+
+
+# Start recording a new profile, discarding the previous one
+def reset_profiler() -> Profiler:
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def profile_count(counter: str, amount: int = 1) -> None:
+    _profiler.count(counter, amount)
+
+
+def profile_phase(name: str):
+    return _profiler.phase(name)
@@ -425,6 +425,7 @@ def evaluate_exit_requirement(search: "Search", exit_: "Entrance") -> int:
 
     for time in ALL_TODS:
         if potential_time_spread & time:
+            search.requirement_evaluations += 1
             eval_test = evaluate_requirement_at_time(
                 exit_.requirement, search, time, exit_.world
             )
@@ -456,6 +457,7 @@ def evaluate_exit_requirement(search: "Search", exit_: "Entrance") -> int:
 
 def evaluate_event_requirement(search: "Search", event) -> int:
     time = search.area_time[event.area.id]
+    search.requirement_evaluations += 1
     if evaluate_requirement_at_time(event.req, search, time, event.area.world):
         return EvalSuccess.COMPLETE
     return EvalSuccess.NONE
@@ -463,6 +465,7 @@ def evaluate_event_requirement(search: "Search", event) -> int:
 
 def evaluate_location_requirement(search: "Search", loc_access) -> int:
     time = search.area_time[loc_access.area.id]
+    search.requirement_evaluations += 1
     if evaluate_requirement_at_time(
         loc_access.req, search, time, loc_access.area.world
     ):
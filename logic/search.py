@@ -1,9 +1,11 @@
 import logging
 from collections import Counter
+from collections.abc import Mapping
 from .item import *
 from .area import *
+from .profiler import profile_count, SEARCHES, REQUIREMENT_EVALUATIONS
 
-from gui.dialogs.dialog_header import print_progress_text, update_progress_value
+from util.progress import print_progress_text, update_progress_value
 
 from typing import TYPE_CHECKING
 
@@ -25,7 +27,7 @@ class Search:
         self,
         search_mode_: int,
         worlds_: list["World"],
-        items_: list[Item] = [],
+        items_: list[Item] | Mapping[Item, int] = [],
         world_to_search_: int = -1,
     ) -> None:
         self.search_mode: int = search_mode_
@@ -52,6 +54,16 @@ class Search:
         self.entrance_spheres: list[list[Entrance]] = []
 
         self.area_time: dict[int, int] = {}
+        # If set, the search stops early once each of these area ids
+        # has been reached at (at least) the given times of day
+        self.areas_to_reach: dict[int, int] = {}
+        self.reached_areas_early: bool = False
+
+        # If set, the iteration each location is visited in gets recorded here
+        self.location_iterations: dict[Location, int] | None = None
+
+        # Requirement evaluations made while searching, for profiling
+        self.requirement_evaluations: int = 0
 
         # Add starting inventory items for each world
         for world in self.worlds:
@@ -111,6 +123,10 @@ class Search:
             self.process_events()
             self.process_exits()
 
+            if self.areas_to_reach and self.has_reached_areas():
+                self.reached_areas_early = True
+                break
+
             # For proper sphere calculation based on item locations
             # we need to keep looping over exits and events until
             # nothing new is found in them (and then process locations)
@@ -127,6 +143,16 @@ class Search:
 
             self.sphere_num += 1
 
+        profile_count(SEARCHES)
+        profile_count(REQUIREMENT_EVALUATIONS, self.requirement_evaluations)
+        self.requirement_evaluations = 0
+
+    def has_reached_areas(self) -> bool:
+        return all(
+            self.area_time.get(area_id, TOD.NONE) & time == time
+            for area_id, time in self.areas_to_reach.items()
+        )
+
     # Explore the given area, and recursively explore the area's connected to it as
     # well if they haven't been visited yet.
     def explore(self, area: Area) -> None:
@@ -210,6 +236,8 @@ class Search:
 
             if evaluate_location_requirement(self, loc_access) == EvalSuccess.COMPLETE:
                 self.visited_locations.add(loc)
+                if self.location_iterations is not None:
+                    self.location_iterations[loc] = self.sphere_num
                 self.new_things_found = True
                 if self.search_mode in [
                     SearchMode.GENERATE_PLAYTHROUGH,
@@ -347,10 +375,22 @@ def game_beatable(worlds: list["World"], item_pool: list[Item] = []) -> bool:
     return search.is_beatable
 
 
-# Checks to see if each world's logic setting is currently satisfied
-def all_logic_satisfied(worlds: list["World"], item_pool: Counter[Item] = {}) -> bool:
+# Checks to see if each world's logic setting is currently satisfied.
+# If the caller knows logic was satisfied before some areas lost their
+# previous access (and nothing else was taken away), it can pass those
+# areas and the times of day they used to have in areas_to_reach. Since
+# logic only ever gains from extra access, logic is still satisfied as
+# soon as all of them are reached again, so the search can stop there.
+def all_logic_satisfied(
+    worlds: list["World"],
+    item_pool: Counter[Item] = {},
+    areas_to_reach: dict[int, int] = {},
+) -> bool:
     search = Search(SearchMode.ALL_LOCATIONS_REACHABLE, worlds, item_pool)
+    search.areas_to_reach = areas_to_reach
     search.search_worlds()
+    if search.reached_areas_early:
+        return True
     for world in worlds:
         if world.setting("logic_rules") == "all_locations_reachable":
             visited_world_locations = [
@@ -400,6 +440,102 @@ def all_logic_satisfied(worlds: list["World"], item_pool: Counter[Item] = {}) ->
     return True
 
 
+# How many playthrough locations or entrances to try taking away at once when
+# paring down the playthrough. Usually about a third of them end up being
+# needed, so larger groups would rarely all be unneeded.
+PLAYTHROUGH_PARING_GROUP_SIZE = 4
+
+
+# Takes the items away from the given locations, in order, as long as the game
+# stays beatable without them, and discards those locations from the set of
+# playthrough locations. Items which are needed are given back. The whole group
+# is tried first. If the game isn't beatable without it, each half is tried
+# next, and so on down to single locations. Since logic is monotone, this takes
+# away the same items as trying one location at a time, but needs fewer
+# beatability checks when most of the locations aren't needed. If required is
+# True, the caller already knows the game isn't beatable without the group.
+def remove_unrequired_items(
+    worlds: list["World"],
+    locations: list[Location],
+    temp_empty_locations: dict[Location, Item],
+    playthrough_locations_set: set[Location],
+    required: bool = False,
+) -> None:
+    if not locations:
+        return
+
+    if not required:
+        items = {location: location.current_item for location in locations}
+        for location in locations:
+            location.remove_current_item()
+
+        # If the game is beatable, temporarily take these items away and
+        # discard the locations from the set of playthrough locations
+        if game_beatable(worlds):
+            temp_empty_locations.update(items)
+            playthrough_locations_set.difference_update(locations)
+            return
+
+        for location, item in items.items():
+            location.set_current_item(item)
+
+    if len(locations) == 1:
+        return
+
+    first_half = locations[: len(locations) // 2]
+    second_half = locations[len(locations) // 2 :]
+    remove_unrequired_items(
+        worlds, first_half, temp_empty_locations, playthrough_locations_set
+    )
+    # If every item in the first half could be taken away, then the game
+    # can't be beaten without the second half
+    remove_unrequired_items(
+        worlds,
+        second_half,
+        temp_empty_locations,
+        playthrough_locations_set,
+        all(location in temp_empty_locations for location in first_half),
+    )
+
+
+# Same as remove_unrequired_items, but for the entrances of the entrance
+# playthrough. Entrances which aren't needed are left disconnected and
+# added to non_required_entrances along with the area they connect to.
+def disconnect_unrequired_entrances(
+    worlds: list["World"],
+    entrances: list[Entrance],
+    non_required_entrances: dict[Entrance, Area],
+    required: bool = False,
+) -> None:
+    if not entrances:
+        return
+
+    if not required:
+        connected_areas = {entrance: entrance.disconnect() for entrance in entrances}
+
+        # If the game is still beatable then these entrances are not required
+        if game_beatable(worlds):
+            non_required_entrances.update(connected_areas)
+            return
+
+        # If any of the entrances are required, reconnect them
+        for entrance, connected_area in connected_areas.items():
+            entrance.connect(connected_area)
+
+    if len(entrances) == 1:
+        return
+
+    first_half = entrances[: len(entrances) // 2]
+    second_half = entrances[len(entrances) // 2 :]
+    disconnect_unrequired_entrances(worlds, first_half, non_required_entrances)
+    disconnect_unrequired_entrances(
+        worlds,
+        second_half,
+        non_required_entrances,
+        all(entrance in non_required_entrances for entrance in first_half),
+    )
+
+
 def generate_playthrough(worlds: list["World"]) -> None:
     logging.getLogger("").debug("Generating Playthrough")
     # Generate initial playthrough
@@ -426,17 +562,14 @@ def generate_playthrough(worlds: list["World"]) -> None:
     # Reverse the playthrough so we're paring it down from highest to lowest sphere
     # This way, lower sphere items will be prioritized for the playthrough
     for sphere in reversed(playthrough_spheres):
-        for location in sphere:
-            item_at_location = location.current_item
-            location.remove_current_item()
-
-            # If the game is beatable, temporarily take this item away and
-            # discard the location to the set of playthrough locations
-            if game_beatable(worlds):
-                temp_empty_locations[location] = item_at_location
-                playthrough_locations_set.discard(location)
-            else:
-                location.set_current_item(item_at_location)
+        sphere_locations = list(sphere)
+        for i in range(0, len(sphere_locations), PLAYTHROUGH_PARING_GROUP_SIZE):
+            remove_unrequired_items(
+                worlds,
+                sphere_locations[i : i + PLAYTHROUGH_PARING_GROUP_SIZE],
+                temp_empty_locations,
+                playthrough_locations_set,
+            )
 
     # Now generate a new playthrough search incase some spheres were flattened
     # by the previous generation having access to extra items
@@ -448,15 +581,15 @@ def generate_playthrough(worlds: list["World"]) -> None:
     non_required_entrances = {}
 
     for sphere in entrance_spheres:
-        for entrance in sphere.copy():
-            connected_area = entrance.disconnect()
-            if game_beatable(worlds):
-                # If the game is still beatable then this entrance is not required
-                sphere.remove(entrance)
-                non_required_entrances[entrance] = connected_area
-            else:
-                # If the entrance is required, reconnect it
-                entrance.connect(connected_area)
+        for i in range(0, len(sphere), PLAYTHROUGH_PARING_GROUP_SIZE):
+            disconnect_unrequired_entrances(
+                worlds,
+                sphere[i : i + PLAYTHROUGH_PARING_GROUP_SIZE],
+                non_required_entrances,
+            )
+        sphere[:] = [
+            entrance for entrance in sphere if entrance not in non_required_entrances
+        ]
 
     # Reconnect all non-required entrances
     for entrance, connected_area in non_required_entrances.items():
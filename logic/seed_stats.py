@@ -0,0 +1,148 @@
+from collections import Counter
+from copy import copy
+from functools import partial
+from pathlib import Path
+import csv
+import multiprocessing as mp
+import logging
+import time
+
+from .generate import GenerationOptions, generate_seed, load_generation_data
+from .parallel import can_fork_workers
+from .profiler import get_profiler, SEARCHES, RETRIES, BACKTRACKS
+from .world import World
+
+HINT_TYPES: list[str] = ["Path", "Barren", "Item", "Location"]
+
+# Columns of the results file, one row per seed
+SEED_STATS_COLUMNS: list[str] = [
+    "seed",
+    "hash",
+    "success",
+    "error",
+    "time",
+    "build_time",
+    "entrance_shuffle_time",
+    "fill_time",
+    "playthrough_time",
+    "hints_time",
+    "spheres",
+    "playthrough_locations",
+    "entrance_spheres",
+    "searches",
+    "retries",
+    "backtracks",
+] + [f"{hint_type.lower()}_hints" for hint_type in HINT_TYPES]
+
+
+def get_seed_stats(worlds: list[World]) -> dict:
+    profiler = get_profiler()
+    phase_times: Counter[str] = Counter()
+    for phase in profiler.phases:
+        if phase.depth != 0:
+            continue
+        # Worlds are built and have their entrances shuffled one at a time
+        if phase.name.startswith("Build "):
+            phase_times["build_time"] += phase.wall_time
+        elif phase.name.startswith("Shuffle Entrances"):
+            phase_times["entrance_shuffle_time"] += phase.wall_time
+        elif phase.name in ["Fill", "Playthrough", "Hints"]:
+            phase_times[f"{phase.name.lower()}_time"] += phase.wall_time
+
+    # Count each hinted location once, no matter how many stones it's on
+    hint_types: Counter[str] = Counter()
+    for world in worlds:
+        hinted_locations = set(world.fi_hints)
+        for locations in world.gossip_stone_hints.values():
+            hinted_locations.update(locations)
+        hint_types.update(location.hint.type for location in hinted_locations)
+
+    stats = {
+        column: round(phase_times[column], 3)
+        for column in [
+            "build_time",
+            "entrance_shuffle_time",
+            "fill_time",
+            "playthrough_time",
+            "hints_time",
+        ]
+    }
+    stats.update(
+        {
+            "hash": worlds[0].config.get_hash(),
+            "spheres": len(worlds[0].playthrough_spheres),
+            "playthrough_locations": sum(
+                len(sphere) for sphere in worlds[0].playthrough_spheres
+            ),
+            "entrance_spheres": len(
+                [sphere for sphere in worlds[0].entrance_spheres if sphere]
+            ),
+            "searches": profiler.counters[SEARCHES],
+            "retries": profiler.counters[RETRIES],
+            "backtracks": profiler.counters[BACKTRACKS],
+        }
+    )
+    for hint_type in HINT_TYPES:
+        stats[f"{hint_type.lower()}_hints"] = hint_types[hint_type]
+    return stats
+
+
+# Generates a single seed and summarizes it as a row of the results file.
+# Failing to generate the seed is one of the things being measured, so
+# errors are recorded in the row instead of being raised.
+def generate_seed_stats(
+    config_file: Path, seed: str, options: GenerationOptions | None = None
+) -> dict:
+    row = {column: "" for column in SEED_STATS_COLUMNS}
+    row["seed"] = seed
+    start = time.perf_counter()
+    try:
+        row.update(get_seed_stats(generate_seed(config_file, seed, options)))
+        row["success"] = True
+    except Exception as e:
+        logging.getLogger("").debug(f"Seed {seed} failed: {e}")
+        row["success"] = False
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["time"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+# Generates every seed with the settings from the config file and writes a
+# summary of each one to a CSV file as soon as it's done. With more than one
+# worker, the seeds are spread over that many worker processes which are forked
+# after the setting and text data have been loaded. Rows are always written in
+# the same order as the seeds. Only the results file is written, not the
+# spoiler logs of every seed. Returns how many seeds were generated
+# successfully.
+def write_seed_stats(
+    config_file: Path,
+    seeds: list[str],
+    filepath: Path | str,
+    workers: int,
+    options: GenerationOptions | None = None,
+) -> int:
+    load_generation_data()
+
+    options = copy(options) if options is not None else GenerationOptions()
+    options.write_spoiler_logs = False
+
+    if workers > 1 and not can_fork_workers():
+        workers = 1
+
+    pool = mp.get_context("fork").Pool(workers) if workers > 1 else None
+    rows = map if pool is None else pool.imap
+    num_successful = 0
+    try:
+        with open(filepath, "w", encoding="utf-8", newline="") as stats_file:
+            writer = csv.DictWriter(stats_file, fieldnames=SEED_STATS_COLUMNS)
+            writer.writeheader()
+            for row in rows(
+                partial(generate_seed_stats, config_file, options=options), seeds
+            ):
+                writer.writerow(row)
+                stats_file.flush()
+                num_successful += row["success"]
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return num_successful
@@ -4,7 +4,7 @@ import random
 import logging
 from filepathconstants import SETTINGS_LIST_PATH
 
-from gui.dialogs.dialog_header import print_progress_text
+from util.progress import print_progress_text
 
 
 class SettingInfoError(RuntimeError):
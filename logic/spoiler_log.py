@@ -4,271 +4,401 @@ from .world import *
 from .entrance_shuffle import create_entrance_pools
 from filepathconstants import CONFIG_PATH, SPOILER_LOGS_PATH
 from constants.randoconstants import VERSION
+import json
 import os
+import uuid
 
 
-def spoiler_format_location(
-    location: Location, longest_name_length: int, override_item_name: str | None = None
-) -> str:
-    spaces = longest_name_length - len(f"{location}")
+# The spoiler log is first built as plain data (dicts, lists and strings) in a
+# single pass over the worlds. The text log is rendered from that data and it
+# can also be written out as compact JSON for tools to read back in.
 
-    if "Goddess Cube" in location.types:
-        return f"{location}: {spaces * ' '}Strike Goddess Cube"
-
-    if override_item_name == None:
-        return f"{location}: {spaces * ' '}{location.current_item}"
-
-    return f"{location}: {spaces * ' '}{override_item_name} # {location.current_item}"
 
+def spoiler_location_data(location: Location) -> dict:
+    location_data = {"location": f"{location}", "item": f"{location.current_item}"}
+    if "Goddess Cube" in location.types:
+        location_data["goddess_cube"] = True
+    elif (
+        location.current_item.name in BOTTLE_ITEMS
+        and location.current_item.name != EMPTY_BOTTLE
+    ):
+        location_data["shown_as"] = EMPTY_BOTTLE
+    return location_data
 
-def spoiler_format_entrance(entrance: Entrance, longest_name_length: int) -> str:
-    spaces = longest_name_length - len(f"{entrance}")
-    replacement = entrance.replaces.original_name
-    parent, connected = replacement.split(" -> ")
-    return f"{entrance}: {spaces * ' '}{connected} from {parent}"
 
+def spoiler_entrance_data(entrance: Entrance) -> dict:
+    parent, connected = entrance.replaces.original_name.split(" -> ")
+    return {"entrance": f"{entrance}", "leads_to": connected, "from": parent}
 
-def log_basic_info(log, config: Config, worlds: list[World]) -> None:
-    log.write(f"Skyward Sword HD Randomizer Version: {VERSION}\n")
-    log.write(f"Seed: {config.seed}\n")
 
+def basic_info_data(config: Config, worlds: list[World]) -> dict:
     clean_config = load_config_from_file(
         CONFIG_PATH, allow_rewrite=False, create_if_blank=True
     )
-    log.write(
-        f"Setting String: {setting_string_from_config(clean_config, worlds[0].location_table)}\n"
+    return {
+        "version": VERSION,
+        "seed": config.seed,
+        "setting_string": setting_string_from_config(
+            clean_config, worlds[0].location_table
+        ),
+        "hash": config.get_hash(),
+    }
+
+
+def settings_data(config: Config, worlds: list[World]) -> dict:
+    worlds_data = {}
+    for world in worlds:
+        world_settings = {}
+        for setting in world.setting_map.settings.values():
+            world_settings[setting.name] = {"value": f"{setting.value}"}
+            if setting.is_using_random_option:
+                world_settings[setting.name][
+                    "random_option"
+                ] = f"{setting.info.random_option}"
+        worlds_data[f"{world}"] = {
+            "settings": world_settings,
+            "starting_inventory": sorted(
+                world.config.settings[0].starting_inventory.elements()
+            ),
+            "excluded_locations": world.setting_map.excluded_locations,
+            "excluded_hint_locations": world.setting_map.excluded_hint_locations,
+            "mixed_entrance_pools": world.setting_map.mixed_entrance_pools,
+        }
+
+    return {
+        "seed": config.seed,
+        "generate_spoiler_log": config.generate_spoiler_log,
+        "plandomizer": config.use_plandomizer,
+        "plandomizer_file": (
+            f"{config.plandomizer_file}" if config.plandomizer_file else None
+        ),
+        "worlds": worlds_data,
+    }
+
+
+def hint_data(location: Location) -> dict:
+    data = {"type": location.hint.type, "text": f"{location.hint}"}
+    if location.hint.type == "Path":
+        data["item"] = f"{location.current_item}"
+    return data
+
+
+def hints_data(world: World) -> dict:
+    return {
+        "fi_hints": [hint_data(location) for location in world.fi_hints],
+        "gossip_stone_hints": {
+            f"{stone}": [hint_data(location) for location in locations]
+            for stone, locations in world.gossip_stone_hints.items()
+        },
+        "song_hints": {f"{song}": f"{hint}" for song, hint in world.song_hints.items()},
+        "impa_sot_hint": (f"{world.impa_sot_hint}" if world.impa_sot_hint else None),
+    }
+
+
+# Collects everything that goes into the spoiler log. Without spoilers, only
+# the basic info and settings are included, as in the anti-spoiler log.
+def build_spoiler_log_data(worlds: list[World], spoilers: bool = True) -> dict:
+    config = worlds[0].config
+    spoiler_data = basic_info_data(config, worlds)
+    if spoilers:
+        spoiler_data["starting_inventory"] = {
+            f"{world}": [
+                f"{item}" for item in sorted(world.starting_item_pool.elements())
+            ]
+            for world in worlds
+            if world.starting_item_pool.total() > 0
+        }
+        spoiler_data["required_dungeons"] = {
+            f"{world}": [d.name for d in world.dungeons.values() if d.required]
+            for world in worlds
+            if any([True for d in world.dungeons.values() if d.required])
+        }
+        spoiler_data["playthrough"] = [
+            [spoiler_location_data(location) for location in sorted(sphere)]
+            for sphere in worlds[0].playthrough_spheres
+        ]
+        spoiler_data["entrance_playthrough"] = [
+            [spoiler_entrance_data(entrance) for entrance in sorted(sphere)]
+            for sphere in worlds[0].entrance_spheres
+        ]
+
+        spoiler_data["all_locations"] = {}
+        for world in worlds:
+            disabled_shuffle_locations = get_disabled_shuffle_locations(
+                world.location_table, world.config
+            )
+            spoiler_data["all_locations"][f"{world}"] = [
+                spoiler_location_data(location)
+                for location in world.location_table.values()
+                if "Gratitude Crystals" in location.types
+                or (
+                    location not in disabled_shuffle_locations
+                    and "Hint Location" not in location.types
+                    and "Goddess Cube" not in location.types
+                )
+            ]
+
+        spoiler_data["all_entrances"] = {}
+        for world in worlds:
+            if not world.get_shuffled_entrances():
+                continue
+            spoiler_data["all_entrances"][f"{world}"] = {
+                f"{entrance_type}": [
+                    spoiler_entrance_data(entrance)
+                    for entrance in sorted(pool)
+                    # Ignore entrances that are impossible
+                    if entrance.requirement.type != RequirementType.IMPOSSIBLE
+                ]
+                for entrance_type, pool in create_entrance_pools(world).items()
+            }
+
+        spoiler_data["hints"] = {
+            f"{world}": hints_data(world)
+            for world in worlds
+            if world.fi_hints
+            or world.gossip_stone_hints
+            or world.song_hints
+            or world.impa_sot_hint
+        }
+
+    spoiler_data["settings"] = settings_data(config, worlds)
+    return spoiler_data
+
+
+def format_location(location_data: dict, longest_name_length: int) -> str:
+    name = location_data["location"]
+    spaces = longest_name_length - len(name)
+
+    if location_data.get("goddess_cube"):
+        return f"{name}: {spaces * ' '}Strike Goddess Cube"
+
+    if "shown_as" not in location_data:
+        return f"{name}: {spaces * ' '}{location_data['item']}"
+
+    return (
+        f"{name}: {spaces * ' '}{location_data['shown_as']} # {location_data['item']}"
     )
-    log.write(f"Hash: {config.get_hash()}\n")
 
 
-def log_settings(log, config: Config, worlds: list[World]) -> None:
-    # Settings
-    log.write(f"\n# Settings\n")
-    log.write(f"seed: {config.seed}\n")
-    log.write(
-        f"generate_spoiler_log: {'true' if config.generate_spoiler_log else 'false'}\n"
+def format_entrance(entrance_data: dict, longest_name_length: int) -> str:
+    name = entrance_data["entrance"]
+    spaces = longest_name_length - len(name)
+    return f"{name}: {spaces * ' '}{entrance_data['leads_to']} from {entrance_data['from']}"
+
+
+def format_hint(hint: dict) -> str:
+    if "item" in hint:
+        return f"{hint['text']} ({hint['item']})"
+    return hint["text"]
+
+
+def render_basic_info(lines: list[str], spoiler_data: dict) -> None:
+    lines.append(f"Skyward Sword HD Randomizer Version: {spoiler_data['version']}")
+    lines.append(f"Seed: {spoiler_data['seed']}")
+    lines.append(f"Setting String: {spoiler_data['setting_string']}")
+    lines.append(f"Hash: {spoiler_data['hash']}")
+
+
+def render_settings(lines: list[str], settings: dict) -> None:
+    lines.append("")
+    lines.append("# Settings")
+    lines.append(f"seed: {settings['seed']}")
+    lines.append(
+        f"generate_spoiler_log: {'true' if settings['generate_spoiler_log'] else 'false'}"
     )
-    log.write(f"plandomizer: {'true' if config.use_plandomizer else 'false'}\n")
-    log.write(
-        f"plandomizer_file: {config.plandomizer_file if config.plandomizer_file else 'null'}\n"
+    lines.append(f"plandomizer: {'true' if settings['plandomizer'] else 'false'}")
+    lines.append(
+        f"plandomizer_file: {settings['plandomizer_file'] if settings['plandomizer_file'] else 'null'}"
     )
-    for world in worlds:
-        log.write(f"{world}:\n")
-        for setting in world.setting_map.settings.values():
-            if setting.is_using_random_option:
-                log.write(
-                    f"    {setting.name}: '{setting.info.random_option}' # chose {setting.value}\n"
+    for world_name, world_data in settings["worlds"].items():
+        lines.append(f"{world_name}:")
+        for setting_name, setting in world_data["settings"].items():
+            if "random_option" in setting:
+                lines.append(
+                    f"    {setting_name}: '{setting['random_option']}' # chose {setting['value']}"
                 )
             else:
-                log.write(f"    {setting.name}: '{setting.value}'\n")
-        log.write(
-            f"    starting_inventory: {sorted(world.config.settings[0].starting_inventory.elements())}\n"
+                lines.append(f"    {setting_name}: '{setting['value']}'")
+        lines.append(f"    starting_inventory: {world_data['starting_inventory']}")
+        lines.append(f"    excluded_locations: {world_data['excluded_locations']}")
+        lines.append(
+            f"    excluded_hint_locations: {world_data['excluded_hint_locations']}"
         )
-        log.write(f"    excluded_locations: {world.setting_map.excluded_locations}\n")
-        log.write(
-            f"    excluded_hint_locations: {world.setting_map.excluded_hint_locations}\n"
+        lines.append(f"    mixed_entrance_pools: {world_data['mixed_entrance_pools']}")
+
+
+# Renders the human readable spoiler log from the data built by
+# build_spoiler_log_data (or read back in from a JSON spoiler log)
+def render_spoiler_log(spoiler_data: dict) -> str:
+    lines: list[str] = []
+    render_basic_info(lines, spoiler_data)
+
+    if "playthrough" not in spoiler_data:
+        render_settings(lines, spoiler_data["settings"])
+        return "\n".join(lines) + "\n"
+
+    # Print starting inventories if there are any
+    if spoiler_data["starting_inventory"]:
+        lines.append("")
+        lines.append("Starting Inventory:")
+        for world_name, items in spoiler_data["starting_inventory"].items():
+            lines.append(f"    {world_name}:")
+            for item in items:
+                lines.append(f"      - {item}")
+
+    # Print Required dungeons if there are any
+    if spoiler_data["required_dungeons"]:
+        lines.append("")
+        lines.append("Required Dungeons:")
+        for world_name, dungeons in spoiler_data["required_dungeons"].items():
+            lines.append(f"    {world_name}:")
+            for dungeon in dungeons:
+                lines.append(f"      - {dungeon}")
+
+    # Print playthrough
+    longest_name_length = max(
+        [
+            len(loc["location"])
+            for sphere in spoiler_data["playthrough"]
+            for loc in sphere
+        ],
+        default=0,
+    )
+    lines.append("")
+    lines.append("Playthrough:")
+    for sphere_num, sphere in enumerate(spoiler_data["playthrough"]):
+        lines.append(f"    Sphere {sphere_num}:")
+        for location in sphere:
+            lines.append("        " + format_location(location, longest_name_length))
+
+    # Print entrance playthrough
+    entrance_spheres = spoiler_data["entrance_playthrough"]
+    longest_name_length = max(
+        [len(e["entrance"]) for sphere in entrance_spheres for e in sphere],
+        default=0,
+    )
+    if any(entrance_spheres):
+        lines.append("")
+        lines.append("Entrance Playthrough:")
+    for sphere_num, sphere in enumerate(entrance_spheres, start=1):
+        if len(sphere) == 0:
+            continue
+        lines.append(f"    Sphere {sphere_num}:")
+        for entrance in sphere:
+            lines.append("        " + format_entrance(entrance, longest_name_length))
+
+    longest_name_length = max(
+        [
+            len(loc["location"])
+            for locations in spoiler_data["all_locations"].values()
+            for loc in locations
+        ],
+        default=0,
+    )
+    lines.append("")
+    lines.append("All Locations:")
+    for world_name, locations in spoiler_data["all_locations"].items():
+        lines.append(f"    {world_name}:")
+        for location in locations:
+            lines.append("        " + format_location(location, longest_name_length))
+
+    if spoiler_data["all_entrances"]:
+        longest_name_length = max(
+            [
+                len(e["entrance"])
+                for pools in spoiler_data["all_entrances"].values()
+                for pool in pools.values()
+                for e in pool
+            ],
+            default=0,
         )
-        log.write(
-            f"    mixed_entrance_pools: {world.setting_map.mixed_entrance_pools}\n"
+        lines.append("")
+        lines.append("All Entrances:")
+        for world_name, pools in spoiler_data["all_entrances"].items():
+            lines.append(f"    {world_name}:")
+            for entrance_type, pool in pools.items():
+                lines.append(f"        {entrance_type}:")
+                for entrance in pool:
+                    lines.append(
+                        "            " + format_entrance(entrance, longest_name_length)
+                    )
+
+    # Print hints if there are any
+    if spoiler_data["hints"]:
+        lines.append("")
+        lines.append("Hints:")
+        for world_name, hints in spoiler_data["hints"].items():
+            lines.append(f"    {world_name}:")
+            if hints["fi_hints"]:
+                lines.append("        Fi Hints:")
+                for hint in hints["fi_hints"]:
+                    lines.append(f"            {format_hint(hint)}")
+            if hints["gossip_stone_hints"]:
+                lines.append("        Gossip Stone Hints:")
+                for stone, stone_hints in hints["gossip_stone_hints"].items():
+                    lines.append(f"            {stone}:")
+                    for hint in stone_hints:
+                        lines.append(f"                {format_hint(hint)}")
+            if hints["song_hints"]:
+                lines.append("        Song Hints:")
+                for song, hint in hints["song_hints"].items():
+                    lines.append(f"            {song}: {hint}")
+            if hints["impa_sot_hint"]:
+                lines.append("        Impa Hint:")
+                lines.append(f"            {hints['impa_sot_hint']}")
+
+    render_settings(lines, spoiler_data["settings"])
+    return "\n".join(lines) + "\n"
+
+
+# Logs are named after the config's hash, so seeds generated at the same time
+# with the same config (e.g. by the generation server) write to the same file.
+# Each file is written to a temporary file first and then moved into place, so
+# a log is never a mix of two writes.
+def write_file_atomically(filepath: str, contents: str) -> None:
+    temp_filepath = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_filepath, "x", encoding="utf-8") as temp_file:
+            temp_file.write(contents)
+        os.replace(temp_filepath, filepath)
+    except BaseException:
+        if os.path.exists(temp_filepath):
+            os.remove(temp_filepath)
+        raise
+
+
+def write_spoiler_files(spoiler_data: dict, filepath: str, write_json: bool) -> None:
+    write_file_atomically(f"{filepath}.txt", render_spoiler_log(spoiler_data))
+
+    if write_json:
+        write_file_atomically(
+            f"{filepath}.json", json.dumps(spoiler_data, separators=(",", ":"))
         )
 
 
-def generate_spoiler_log(worlds: list[World]) -> None:
+def generate_spoiler_log(worlds: list[World], write_json: bool = False) -> None:
     print_progress_text("Generating Spoiler Log")
 
     # Create logs folder if it doesn't exist
     os.makedirs(SPOILER_LOGS_PATH, exist_ok=True)
 
     config = worlds[0].config
-    filepath = f"{SPOILER_LOGS_PATH}/{config.get_hash()} Spoiler Log.txt"
-
-    with open(filepath, "w", encoding="utf-8") as spoiler_log:
-        log_basic_info(spoiler_log, config, worlds)
-
-        # Print starting inventories if there are any
-        if worlds_with_starting_inventories := [
-            w for w in worlds if w.starting_item_pool.total() > 0
-        ]:
-            spoiler_log.write("\nStarting Inventory:\n")
-            for world in worlds_with_starting_inventories:
-                spoiler_log.write(f"    {world}:\n")
-                for item in sorted(world.starting_item_pool.elements()):
-                    spoiler_log.write(f"      - {item}\n")
-
-        # Print Required dungeons if there are any
-        if worlds_with_requried_dungeons := [
-            w for w in worlds if any([True for d in w.dungeons.values() if d.required])
-        ]:
-            spoiler_log.write("\nRequired Dungeons:\n")
-            for world in worlds_with_requried_dungeons:
-                spoiler_log.write(f"    {world}:\n")
-                for dungeon in world.dungeons.values():
-                    if dungeon.required:
-                        spoiler_log.write(f"      - {dungeon.name}\n")
-
-        # Get name lengths for pretty formating
-        longest_name_length = 0
-        for sphere in worlds[0].playthrough_spheres:
-            for location in sphere:
-                longest_name_length = max(longest_name_length, len(f"{location}"))
-
-        # Print playthrough
-        sphere_num = 0
-        spoiler_log.write("\nPlaythrough:\n")
-        for sphere in worlds[0].playthrough_spheres:
-            sphere = sorted(sphere)
-            spoiler_log.write(f"    Sphere {sphere_num}:\n")
-            for location in sphere:
-                override_item_name = None
-                if (
-                    location.current_item.name in BOTTLE_ITEMS
-                    and location.current_item.name != EMPTY_BOTTLE
-                ):
-                    override_item_name = EMPTY_BOTTLE
-
-                spoiler_log.write(
-                    "        "
-                    + spoiler_format_location(
-                        location,
-                        longest_name_length,
-                        override_item_name=override_item_name,
-                    )
-                    + "\n"
-                )
-            sphere_num += 1
-
-        # Get name lengths for entrances for pretty formatting
-        longest_name_length = 0
-        for sphere in worlds[0].entrance_spheres:
-            for entrance in sphere:
-                longest_name_length = max(longest_name_length, len(f"{entrance}"))
-
-        # Print entrance playthrough
-        sphere_num = 0
-        if len([e for sphere in worlds[0].entrance_spheres for e in sphere]) > 0:
-            spoiler_log.write("\nEntrance Playthrough:\n")
-        for sphere in worlds[0].entrance_spheres:
-            sphere_num += 1
-            if len(sphere) == 0:
-                continue
-            spoiler_log.write(f"    Sphere {sphere_num}:\n")
-
-            for entrance in sorted(sphere):
-                spoiler_log.write(
-                    "        "
-                    + spoiler_format_entrance(entrance, longest_name_length)
-                    + "\n"
-                )
-
-        # Recalculate longest name length for all locations
-        longest_name_length = 0
-        for location in worlds[0].location_table.values():
-            if "Goddess Cube" not in location.types:
-                longest_name_length = max(longest_name_length, len(f"{location}"))
-
-        spoiler_log.write("\nAll Locations:\n")
-        for world in worlds:
-            spoiler_log.write(f"    {world}:\n")
+    write_spoiler_files(
+        build_spoiler_log_data(worlds),
+        f"{SPOILER_LOGS_PATH}/{config.get_hash()} Spoiler Log",
+        write_json,
+    )
 
-            disabled_shuffle_locations = get_disabled_shuffle_locations(
-                world.location_table, world.config
-            )
 
-            for location in world.location_table.values():
-                if "Gratitude Crystals" in location.types or (
-                    location not in disabled_shuffle_locations
-                    and "Hint Location" not in location.types
-                    and "Goddess Cube" not in location.types
-                ):
-                    override_item_name = None
-                    if (
-                        location.current_item.name in BOTTLE_ITEMS
-                        and location.current_item.name != EMPTY_BOTTLE
-                    ):
-                        override_item_name = EMPTY_BOTTLE
-
-                    spoiler_log.write(
-                        "        "
-                        + spoiler_format_location(
-                            location,
-                            longest_name_length,
-                            override_item_name=override_item_name,
-                        )
-                        + "\n"
-                    )
-
-        # Recalculate longest name length for all shuffled entrances
-        longest_name_length = 0
-        for world in worlds:
-            for entrance in world.get_shuffled_entrances():
-                longest_name_length = max(longest_name_length, len(f"{entrance}"))
-
-        if worlds_with_shuffled_entrances := [
-            w for w in worlds if len(w.get_shuffled_entrances()) > 0
-        ]:
-            spoiler_log.write("\nAll Entrances:\n")
-            for world in worlds_with_shuffled_entrances:
-                spoiler_log.write(f"    {world}:\n")
-                entrance_pools = create_entrance_pools(world)
-                for entrance_type, pool in entrance_pools.items():
-                    spoiler_log.write(f"        {entrance_type}:\n")
-                    for entrance in sorted(pool):
-                        # Ignore entrances that are impossible
-                        if entrance.requirement.type == RequirementType.IMPOSSIBLE:
-                            continue
-                        spoiler_log.write(
-                            "            "
-                            + spoiler_format_entrance(entrance, longest_name_length)
-                            + "\n"
-                        )
-
-        # Print hints if there are any
-        if worlds_with_hints := [
-            world
-            for world in worlds
-            if world.fi_hints
-            or world.gossip_stone_hints
-            or world.song_hints
-            or world.impa_sot_hint
-        ]:
-            spoiler_log.write("\nHints:\n")
-            for world in worlds_with_hints:
-                spoiler_log.write(f"    {world}:\n")
-                if world.fi_hints:
-                    spoiler_log.write("        Fi Hints:\n")
-                    for location in world.fi_hints:
-                        spoiler_log.write(f"            {location.hint}")
-                        if location.hint.type == "Path":
-                            spoiler_log.write(f" ({location.current_item})")
-                        spoiler_log.write("\n")
-                if world.gossip_stone_hints:
-                    spoiler_log.write("        Gossip Stone Hints:\n")
-                    for stone, locations in world.gossip_stone_hints.items():
-                        spoiler_log.write(f"            {stone}:\n")
-                        for location in locations:
-                            spoiler_log.write(f"                {location.hint}")
-                            if location.hint.type == "Path":
-                                spoiler_log.write(f" ({location.current_item})")
-                            spoiler_log.write("\n")
-                if world.song_hints:
-                    spoiler_log.write("        Song Hints:\n")
-                    for song, hint in world.song_hints.items():
-                        spoiler_log.write(f"            {song}: {hint}\n")
-                if world.impa_sot_hint:
-                    spoiler_log.write("        Impa Hint:\n")
-                    spoiler_log.write(f"            {world.impa_sot_hint}\n")
-
-        log_settings(spoiler_log, config, worlds)
-
-
-def generate_anti_spoiler_log(worlds: list[World]) -> None:
+def generate_anti_spoiler_log(worlds: list[World], write_json: bool = False) -> None:
     print_progress_text("Generating Anti-Spoiler Log")
 
     # Create logs folder if it doesn't exist
     os.makedirs(SPOILER_LOGS_PATH, exist_ok=True)
 
     config = worlds[0].config
-    filepath = f"{SPOILER_LOGS_PATH}/{config.get_hash()} Anti Spoiler Log.txt"
-    with open(filepath, "w", encoding="utf-8") as anti_spoiler_log:
-        log_basic_info(anti_spoiler_log, config, worlds)
-        log_settings(anti_spoiler_log, config, worlds)
+    write_spoiler_files(
+        build_spoiler_log_data(worlds, spoilers=False),
+        f"{SPOILER_LOGS_PATH}/{config.get_hash()} Anti Spoiler Log",
+        write_json,
+    )
@@ -1,6 +1,10 @@
 from constants.itemconstants import ALL_JUNK_ITEMS, TRAP_SETTING_TO_ITEM, BOTTLE_ITEMS
 from filepathconstants import ITEMS_PATH, MACROS_DATA_PATH, WORLD_DATA_PATH
-from logic.location_table import build_location_table, get_disabled_shuffle_locations
+from logic.location_table import (
+    build_location_table,
+    get_disabled_shuffle_locations,
+    get_location_data,
+)
 from .config import Config
 from .settings import *
 from .item import Item
@@ -13,7 +17,8 @@ from .search import game_beatable, Search, SearchMode
 from util.text import *
 
 from collections import Counter, OrderedDict
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 import logging
 import yaml
 
@@ -29,6 +34,31 @@ class WrongInfoError(RuntimeError):
     pass
 
 
+# Parsing the data files takes up most of the time needed to build a world,
+# and their contents never depend on the settings, so each file is only
+# parsed once per process. The parsed data is shared by every world that
+# gets built, so it must never be modified.
+_world_data_files: dict[Path, Any] = {}
+
+
+def load_world_data_file(filepath: Path) -> Any:
+    if filepath not in _world_data_files:
+        with open(filepath, "r", encoding="utf-8") as data_file:
+            _world_data_files[filepath] = yaml.safe_load(data_file)
+    return _world_data_files[filepath]
+
+
+# Parse every data file up front, e.g. before forking worker processes
+# so that they all share the parsed data
+def load_all_world_data_files() -> None:
+    get_location_data()
+    load_world_data_file(ITEMS_PATH)
+    load_world_data_file(MACROS_DATA_PATH)
+    for filepath in sorted(WORLD_DATA_PATH.iterdir()):
+        if filepath.as_posix().endswith(".yaml"):
+            load_world_data_file(filepath)
+
+
 class World:
     event_id_counter: int = 0
     area_id_counter: int = 0
@@ -95,60 +125,57 @@ class World:
     # for this world
     def build_item_table(self) -> None:
         logging.getLogger("").debug(f"Building Item Table for {self}")
-        with open(ITEMS_PATH, "r", encoding="utf-8") as item_data_file:
-            item_data = yaml.safe_load(item_data_file)
-            for item_node in item_data:
-                # Check to make sure all neccesary fields exist
-                for field in ["id", "name", "oarc"]:
-                    if field not in item_node:
-                        raise MissingInfoError(
-                            f"item \"{item_node['name']}\" is missing the \"{field}\" field in items.yaml"
-                        )
+        item_data = load_world_data_file(ITEMS_PATH)
+        for item_node in item_data:
+            # Check to make sure all neccesary fields exist
+            for field in ["id", "name", "oarc"]:
+                if field not in item_node:
+                    raise MissingInfoError(
+                        f"item \"{item_node['name']}\" is missing the \"{field}\" field in items.yaml"
+                    )
 
-                item_id = int(item_node["id"])
-                name = item_node["name"]
-                oarcs = item_node["oarc"]
-                major_item = item_node.get("advancement", False)
-                game_winning_item = item_node.get("game_winning_item", False)
-                chain_locations = item_node.get("chain_locations", [])
-
-                stripped_name = name.replace("'", "")
-                self.item_table[stripped_name] = Item(
-                    item_id,
-                    name,
-                    oarcs,
-                    self,
-                    major_item,
-                    game_winning_item,
-                    chain_locations,
+            item_id = int(item_node["id"])
+            name = item_node["name"]
+            oarcs = item_node["oarc"]
+            major_item = item_node.get("advancement", False)
+            game_winning_item = item_node.get("game_winning_item", False)
+            chain_locations = item_node.get("chain_locations", [])
+
+            stripped_name = name.replace("'", "")
+            self.item_table[stripped_name] = Item(
+                item_id,
+                name,
+                oarcs,
+                self,
+                major_item,
+                game_winning_item,
+                chain_locations,
+            )
+            logging.getLogger("").debug(f"Processing new item {name}\tid: {item_id}")
+
+            # Assign this item to its appropriate dungeon if it's a dungeon item
+            item = self.item_table[stripped_name]
+            if item.is_dungeon_small_key:
+                dungeon_name = item.name.replace(" Small Key", "")
+                self.add_dungeon(dungeon_name)
+                self.get_dungeon(dungeon_name).small_key = item
+                logging.getLogger("").debug(
+                    f"Assigned {item} as small key for dungeon {dungeon_name}"
                 )
+            elif item.is_boss_key:
+                dungeon_name = item.name.replace(" Boss Key", "")
+                self.add_dungeon(dungeon_name)
+                self.get_dungeon(dungeon_name).boss_key = item
                 logging.getLogger("").debug(
-                    f"Processing new item {name}\tid: {item_id}"
+                    f"Assigned {item} as boss key for dungeon {dungeon_name}"
+                )
+            elif item.is_dungeon_map:
+                dungeon_name = item.name.replace(" Map", "")
+                self.add_dungeon(dungeon_name)
+                self.get_dungeon(dungeon_name).map = item
+                logging.getLogger("").debug(
+                    f"Assigned {item} as map for dungeon {dungeon_name}"
                 )
-
-                # Assign this item to its appropriate dungeon if it's a dungeon item
-                item = self.item_table[stripped_name]
-                if item.is_dungeon_small_key:
-                    dungeon_name = item.name.replace(" Small Key", "")
-                    self.add_dungeon(dungeon_name)
-                    self.get_dungeon(dungeon_name).small_key = item
-                    logging.getLogger("").debug(
-                        f"Assigned {item} as small key for dungeon {dungeon_name}"
-                    )
-                elif item.is_boss_key:
-                    dungeon_name = item.name.replace(" Boss Key", "")
-                    self.add_dungeon(dungeon_name)
-                    self.get_dungeon(dungeon_name).boss_key = item
-                    logging.getLogger("").debug(
-                        f"Assigned {item} as boss key for dungeon {dungeon_name}"
-                    )
-                elif item.is_dungeon_map:
-                    dungeon_name = item.name.replace(" Map", "")
-                    self.add_dungeon(dungeon_name)
-                    self.get_dungeon(dungeon_name).map = item
-                    logging.getLogger("").debug(
-                        f"Assigned {item} as map for dungeon {dungeon_name}"
-                    )
 
     # Read locations.yaml and store all necessary data in a dict
     # for this world
@@ -157,12 +184,11 @@ class World:
 
     def load_logic_macros(self) -> None:
         logging.getLogger("").debug(f"Loading macros for {self}")
-        with open(MACROS_DATA_PATH, "r", encoding="utf-8") as macros_data_file:
-            macros_data = yaml.safe_load(macros_data_file)
-            for macro_name, req_str in macros_data.items():
-                self.macros[macro_name] = parse_requirement_string(
-                    req_str, self, force_logic=True
-                )
+        macros_data = load_world_data_file(MACROS_DATA_PATH)
+        for macro_name, req_str in macros_data.items():
+            self.macros[macro_name] = parse_requirement_string(
+                req_str, self, force_logic=True
+            )
 
     def load_world_graph(self) -> None:
         logging.getLogger("").debug(f"Loading world graph for {self}")
@@ -176,88 +202,83 @@ class World:
             if not filepath.as_posix().endswith(".yaml"):
                 continue
 
-            with open(filepath, "r", encoding="utf-8") as world_data_file:
-                world_data = yaml.safe_load(world_data_file)
-                for area_node in world_data:
-                    # Check to make sure all required fields exist
-                    for field in ["name"]:
-                        if field not in area_node:
-                            raise MissingInfoError(
-                                f"An area node is missing the name field"
-                            )
-
-                    area_name = area_node["name"]
-                    self.add_area(area_name)
-                    new_area = self.areas[self.area_ids[area_name]]
-                    new_area.name = area_name
-                    new_area.world = self
-                    defined_areas.add(new_area)
-
-                    if (
-                        "allowed_time_of_day" in area_node
-                        and self.setting("natural_night_connections") == "on"
-                    ):
-                        new_area.allowed_tod = (
-                            TOD.DAY
-                            if area_node["allowed_time_of_day"] == "Day Only"
-                            else TOD.ALL
+            world_data = load_world_data_file(filepath)
+            for area_node in world_data:
+                # Check to make sure all required fields exist
+                for field in ["name"]:
+                    if field not in area_node:
+                        raise MissingInfoError(
+                            f"An area node is missing the name field"
                         )
 
-                    new_area.can_sleep = area_node.get("can_sleep", False)
-
-                    if dungeon_name := area_node.get("dungeon", False):
-                        self.add_dungeon(dungeon_name)
-                        new_area.hint_regions.add(dungeon_name)
-                        if "dungeon_starting_area" in area_node:
-                            self.get_dungeon(dungeon_name).starting_area = new_area
-                    elif hint_region := area_node.get("hint_region", False):
-                        new_area.hint_regions.add(hint_region)
-
-                    if "events" in area_node:
-                        for event_name, req_str in area_node["events"].items():
-                            # Replace spaces with underscores to match logic syntax
-                            event_name = event_name.replace(" ", "_")
-                            defined_events.add(event_name)
-                            self.add_event(event_name)
-                            event_req = parse_requirement_string(req_str, self)
-                            new_area.events.append(
-                                EventAccess(
-                                    self.events[event_name], event_req, new_area
-                                )
-                            )
+                area_name = area_node["name"]
+                self.add_area(area_name)
+                new_area = self.areas[self.area_ids[area_name]]
+                new_area.name = area_name
+                new_area.world = self
+                defined_areas.add(new_area)
 
-                    if "locations" in area_node:
-                        for location_name, req_str in area_node["locations"].items():
-                            location_req = parse_requirement_string(req_str, self)
-                            new_area.locations.append(
-                                LocationAccess(
-                                    self.get_location(location_name),
-                                    location_req,
-                                    new_area,
-                                )
-                            )
-                            # Add the LocationAccess to the list of access points for the location
-                            self.get_location(location_name).loc_access_list.append(
-                                new_area.locations[-1]
-                            )
-                            # Add the location to the dungeon if this area is part of one
-                            if dungeon_name := area_node.get("dungeon", False):
-                                dungeon = self.get_dungeon(dungeon_name)
-                                location = self.get_location(location_name)
-                                if location not in dungeon.locations:
-                                    dungeon.locations.append(location)
-
-                    if "exits" in area_node:
-                        for connected_area_name, req_str in area_node["exits"].items():
-                            exit_req = parse_requirement_string(req_str, self)
-                            self.add_area(connected_area_name)
-                            connected_area = self.areas[
-                                self.area_ids[connected_area_name]
-                            ]
-                            connected_area.name = connected_area_name
-                            new_area.exits.append(
-                                Entrance(new_area, connected_area, exit_req, self)
+                if (
+                    "allowed_time_of_day" in area_node
+                    and self.setting("natural_night_connections") == "on"
+                ):
+                    new_area.allowed_tod = (
+                        TOD.DAY
+                        if area_node["allowed_time_of_day"] == "Day Only"
+                        else TOD.ALL
+                    )
+
+                new_area.can_sleep = area_node.get("can_sleep", False)
+
+                if dungeon_name := area_node.get("dungeon", False):
+                    self.add_dungeon(dungeon_name)
+                    new_area.hint_regions.add(dungeon_name)
+                    if "dungeon_starting_area" in area_node:
+                        self.get_dungeon(dungeon_name).starting_area = new_area
+                elif hint_region := area_node.get("hint_region", False):
+                    new_area.hint_regions.add(hint_region)
+
+                if "events" in area_node:
+                    for event_name, req_str in area_node["events"].items():
+                        # Replace spaces with underscores to match logic syntax
+                        event_name = event_name.replace(" ", "_")
+                        defined_events.add(event_name)
+                        self.add_event(event_name)
+                        event_req = parse_requirement_string(req_str, self)
+                        new_area.events.append(
+                            EventAccess(self.events[event_name], event_req, new_area)
+                        )
+
+                if "locations" in area_node:
+                    for location_name, req_str in area_node["locations"].items():
+                        location_req = parse_requirement_string(req_str, self)
+                        new_area.locations.append(
+                            LocationAccess(
+                                self.get_location(location_name),
+                                location_req,
+                                new_area,
                             )
+                        )
+                        # Add the LocationAccess to the list of access points for the location
+                        self.get_location(location_name).loc_access_list.append(
+                            new_area.locations[-1]
+                        )
+                        # Add the location to the dungeon if this area is part of one
+                        if dungeon_name := area_node.get("dungeon", False):
+                            dungeon = self.get_dungeon(dungeon_name)
+                            location = self.get_location(location_name)
+                            if location not in dungeon.locations:
+                                dungeon.locations.append(location)
+
+                if "exits" in area_node:
+                    for connected_area_name, req_str in area_node["exits"].items():
+                        exit_req = parse_requirement_string(req_str, self)
+                        self.add_area(connected_area_name)
+                        connected_area = self.areas[self.area_ids[connected_area_name]]
+                        connected_area.name = connected_area_name
+                        new_area.exits.append(
+                            Entrance(new_area, connected_area, exit_req, self)
+                        )
 
         # Check to make sure all events were properly defined
         for event in self.events:
@@ -389,12 +410,12 @@ class World:
         self.choose_required_dungeons()
 
     def assign_all_areas_hint_regions(self):
-        for area in self.areas.values():
-            # Assign hint regions to all areas which don't
-            # have them at this point. This will also finalize
-            # dungeon locations.
-            assign_hint_regions_and_dungeon_locations(area)
+        # Assign hint regions to all areas which don't
+        # have them at this point. This will also finalize
+        # dungeon locations.
+        assign_all_hint_regions_and_dungeon_locations(self.areas.values())
 
+        for area in self.areas.values():
             # Also assign dungeons their entrance properties
             # so we can lookup their region later if necessary
             for exit_ in area.exits:
@@ -649,27 +670,25 @@ class World:
 
     # Replaces a portion of the non-major item pool with traps.
     def add_traps(self) -> None:
-        item_pool_copy: list[Item] = []
-
-        # Get item pool as list
-        for item, count in self.item_pool.items():
-            item_pool_copy.extend([item] * count)
-
-        # Remove major items from item pool
-        major_item_pool = [item for item in item_pool_copy if item.is_major_item]
-        non_major_item_pool = [
-            item for item in item_pool_copy if not item.is_major_item
+        # Work with item counts rather than expanding
+        # the item pool into a list of every item
+        non_major_items = [
+            item
+            for item, count in self.item_pool.items()
+            if count > 0 and not item.is_major_item
         ]
+        non_major_counts = [self.item_pool[item] for item in non_major_items]
+        num_non_major_items = sum(non_major_counts)
 
         match self.setting("trap_mode"):
             case "trapish":
-                num_traps = len(non_major_item_pool) // 10
+                num_traps = num_non_major_items // 10
             case "trapsome":
-                num_traps = len(non_major_item_pool) // 4
+                num_traps = num_non_major_items // 4
             case "traps_o_plenty":
-                num_traps = len(non_major_item_pool) // 2
+                num_traps = num_non_major_items // 2
             case "traptacular":
-                num_traps = len(non_major_item_pool)
+                num_traps = num_non_major_items
             case _:
                 num_traps = 0
 
@@ -679,26 +698,17 @@ class World:
             if self.setting(trap_name) == "on"
         ]
 
-        if len(possible_traps) <= 0:
+        # random.sample can't sample from an empty population, even when
+        # no items are being chosen
+        if len(possible_traps) <= 0 or num_traps <= 0:
             return
 
-        # Replace non-major items with traps
-        random.shuffle(non_major_item_pool)
-
-        for replace_index in range(0, num_traps):
-            if replace_index >= len(non_major_item_pool):
-                break
-
-            trap_item = TRAP_SETTING_TO_ITEM[random.choice(possible_traps)]
-            non_major_item_pool[replace_index] = self.get_item(trap_item)
-
-        new_item_pool = major_item_pool + non_major_item_pool
-
-        assert len(item_pool_copy) == len(new_item_pool)
+        # Replace random non-major items with traps
+        for item in random.sample(non_major_items, num_traps, counts=non_major_counts):
+            self.item_pool[item] -= 1
 
-        self.item_pool = Counter()
-        for item in new_item_pool:
-            self.item_pool[item] += 1
+        for trap_name in random.choices(possible_traps, k=num_traps):
+            self.item_pool[self.get_item(TRAP_SETTING_TO_ITEM[trap_name])] += 1
 
     # Adds a new event if one with the current name doesn't exist
     def add_event(self, event_name: str) -> None:
@@ -1,5 +1,5 @@
 from filepathconstants import OBJECTPACK_PATH_TAIL, SSHD_EXTRACT_PATH
-from gui.dialogs.dialog_header import print_progress_text, update_progress_value
+from util.progress import print_progress_text, update_progress_value
 from logic.world import World
 from patches.asmpatchhandler import ASMPatchHandler
 from patches.conditionalpatchhandler import ConditionalPatchHandler
@@ -25,7 +25,7 @@ import random
 from constants.asmconstants import *
 
 from lz4.block import compress, decompress
-from gui.dialogs.dialog_header import print_progress_text
+from util.progress import print_progress_text
 from logic.world import World
 
 from patches.asmpatchhelper import NsoOffsets, SegmentHeader
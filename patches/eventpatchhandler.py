@@ -16,7 +16,7 @@ from filepathconstants import (
 
 from collections import defaultdict
 from pathlib import Path
-from gui.dialogs.dialog_header import (
+from util.progress import (
     get_progress_value_from_range,
     update_progress_value,
 )
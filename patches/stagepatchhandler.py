@@ -1,7 +1,7 @@
 from patches.stagepatchhelper import patch_additional_properties
-from util.arguments import get_program_args
-from gui.dialogs.dialog_header import (
+from util.progress import (
     get_progress_value_from_range,
+    is_showing_progress,
     print_progress_text,
     update_progress_value,
 )
@@ -44,8 +44,6 @@ from filepathconstants import (
     ENDROLL_SOURCE_PATH,
 )
 
-args = get_program_args()
-
 
 def patch_tbox(
     bzs: dict, itemid: int, object_id_str: str, trapid: int, tbox_subtype: int
@@ -1095,8 +1093,8 @@ class StagePatchHandler:
             # TODO: remove race condition - https://docs.python.org/3/library/multiprocessing.html#exchanging-objects-between-processes
             total_stage_count = len(all_stage_file_paths)
 
-            # imap *can* be slower so only use it with the gui (where we need a progress output)
-            if not args.nogui:
+            # imap *can* be slower so only use it when the progress is being shown
+            if is_showing_progress():
                 for _ in pool.imap_unordered(
                     patch_stage_func,
                     [stage_path for stage_path in all_stage_file_paths],
@@ -1,20 +1,28 @@
 from constants.verificationconstants import *
 from filepathconstants import CONFIG_PATH
-from logic.generate import generate
+from logic.generate import (
+    GenerationOptions,
+    check_seed_folder_name,
+    generate,
+    generate_seed,
+    load_generation_data,
+)
+from logic.seed_stats import write_seed_stats
 from patches.allpatchhandler import AllPatchHandler
 from randomizer.verify_extract import verify_extract
 from util.arguments import get_program_args
-from gui.dialogs.dialog_header import update_progress_value
+from util.progress import update_progress_value
+import random
 
 
 def randomize():
-    print("Starting new randomization:")
     args = get_program_args()
+    print("Starting new randomization:")
 
     if not args.dryrun:
         verify_extract()
 
-    worlds = generate(CONFIG_PATH)
+    worlds = generate(CONFIG_PATH, GenerationOptions.from_program_args(args))
 
     if not args.dryrun:
         patch_handler = AllPatchHandler(worlds[0])
@@ -27,3 +35,69 @@ def randomize():
         print(
             f"\nThe randomizer patch can be found at: {worlds[0].config.output_dir.as_posix()}"
         )
+
+
+def get_batch_seeds() -> list[str]:
+    args = get_program_args()
+    if not args.seeds_from:
+        return [str(random.randint(0, 0xFFFFFFFF)) for _ in range(args.batch)]
+
+    with open(args.seeds_from, "r", encoding="utf-8") as seeds_file:
+        seeds = [line.strip() for line in seeds_file if line.strip()]
+    if args.batch:
+        seeds = seeds[: args.batch]
+    # Reject bad seeds before anything is generated
+    for seed in seeds:
+        check_seed_folder_name(seed)
+    return seeds
+
+
+# Generates (and patches) many seeds in one go. The setting and text data
+# are only loaded once, and a seed failing doesn't stop the rest of the batch.
+def randomize_batch():
+    args = get_program_args()
+    seeds = get_batch_seeds()
+    print(f"Starting batch randomization of {len(seeds)} seeds:")
+
+    if not args.dryrun:
+        verify_extract()
+
+    load_generation_data()
+    options = GenerationOptions.from_program_args(args)
+
+    failed_seeds: list[str] = []
+    for seed in seeds:
+        try:
+            worlds = generate_seed(CONFIG_PATH, seed, options)
+            if not args.dryrun:
+                patch_handler = AllPatchHandler(worlds[0])
+                patch_handler.do_all_patches()
+        except Exception as e:
+            print(f"Seed {seed} failed: {e}")
+            failed_seeds.append(seed)
+
+    print(
+        f"Batch randomization complete! {len(seeds) - len(failed_seeds)} of {len(seeds)} seeds were generated."
+    )
+    if failed_seeds:
+        print(f"Failed seeds: {', '.join(failed_seeds)}")
+
+
+# Generates many seeds only to collect statistics about them, so nothing
+# is patched and the game files don't need to be extracted
+def generate_stats():
+    args = get_program_args()
+    seeds = get_batch_seeds()
+    print(f"Generating {len(seeds)} seeds for statistics:")
+
+    num_successful = write_seed_stats(
+        CONFIG_PATH,
+        seeds,
+        args.stats,
+        args.stats_workers,
+        GenerationOptions.from_program_args(args),
+    )
+
+    print(
+        f"Generated {num_successful} of {len(seeds)} seeds. The results can be found at: {args.stats}"
+    )
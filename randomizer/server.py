@@ -0,0 +1,262 @@
+from filepathconstants import CONFIG_PATH, SPOILER_LOGS_PATH
+from logic.config import Config, load_config_from_file
+from logic.generate import (
+    GenerationOptions,
+    generate_randomizer,
+    load_generation_config,
+    load_generation_data,
+)
+from logic.parallel import can_fork
+from logic.world import load_all_world_data_files
+from patches.allpatchhandler import AllPatchHandler
+from randomizer.setting_string import update_config_from_setting_string
+from randomizer.verify_extract import verify_extract
+from util.arguments import get_program_args
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import json
+import logging
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+
+# A local generation service for generating seeds on demand. Jobs are sent to it
+# over HTTP on localhost:
+#
+#   POST /jobs       Queues a new job. The body is either a config file (YAML) or
+#                    a JSON object with a "setting_string". Responds with the
+#                    job's id.
+#   GET  /jobs/<id>  Responds with the job's status ("queued", "done" or "failed")
+#                    along with its result or error.
+#
+# Jobs are generated by a pool of worker processes which are forked after all
+# the generation data has been loaded, so no job has to pay for loading it.
+# Patches are skipped with --dryrun, in which case the game doesn't have to be
+# extracted.
+#
+# Finished jobs are forgotten after JOB_RETENTION_TIME seconds, or sooner once
+# there are more than MAX_FINISHED_JOBS of them.
+
+# Largest request body accepted, in bytes
+MAX_REQUEST_BODY_SIZE: int = 1024 * 1024
+JOB_RETENTION_TIME: float = 60 * 60
+MAX_FINISHED_JOBS: int = 1000
+
+
+def load_job_config(job: dict) -> Config:
+    if "setting_string" in job:
+        return update_config_from_setting_string(
+            load_generation_config(CONFIG_PATH), job["setting_string"], None
+        )
+
+    # Configs can only be loaded from files
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".yaml", encoding="utf-8", delete=False
+    ) as config_file:
+        config_file.write(job["config"])
+    try:
+        config = load_config_from_file(Path(config_file.name), allow_rewrite=False)
+    finally:
+        os.remove(config_file.name)
+    return config
+
+
+def load_worker_data() -> None:
+    load_generation_data()
+    load_all_world_data_files()
+
+
+# Runs in a worker process. Each job's patch goes in its own folder
+# inside the configured output folder, named after the job's id.
+def run_job(job_id: str, job: dict, dryrun: bool, options: GenerationOptions) -> dict:
+    config = load_job_config(job)
+    if config.seed == "":
+        config.seed = str(random.randint(0, 0xFFFFFFFF))
+    config.output_dir = config.output_dir / job_id
+
+    worlds = generate_randomizer(config, options)
+    if not dryrun:
+        AllPatchHandler(worlds[0]).do_all_patches()
+
+    config_hash = config.get_hash()
+    return {
+        "seed": config.seed,
+        "hash": config_hash,
+        "spoiler_log": (
+            f"{SPOILER_LOGS_PATH}/{config_hash} Spoiler Log.txt"
+            if config.generate_spoiler_log
+            else None
+        ),
+        "anti_spoiler_log": f"{SPOILER_LOGS_PATH}/{config_hash} Anti Spoiler Log.txt",
+        "output_dir": None if dryrun else config.output_dir.as_posix(),
+    }
+
+
+class GenerationServer(ThreadingHTTPServer):
+    def __init__(
+        self, port: int, workers: int, dryrun: bool, options: GenerationOptions
+    ) -> None:
+        # Forked workers already have all the data loaded. Otherwise,
+        # each worker has to load it for itself when it starts. The pool
+        # is created before the server opens its socket so the workers
+        # don't inherit it.
+        if can_fork():
+            self.pool = mp.get_context("fork").Pool(max(workers, 1))
+        else:
+            self.pool = mp.Pool(max(workers, 1), initializer=load_worker_data)
+        try:
+            super().__init__(("127.0.0.1", port), GenerationRequestHandler)
+        except BaseException:
+            self.pool.terminate()
+            raise
+        self.dryrun = dryrun
+        self.options = options
+        self.jobs: dict[str, dict] = {}
+        # Maps finished jobs to when they finished, oldest first
+        self.job_finish_times: dict[str, float] = {}
+        self.jobs_lock = threading.Lock()
+
+    # Must be called with the jobs lock held
+    def prune_jobs(self) -> None:
+        expire_time = time.monotonic() - JOB_RETENTION_TIME
+        for job_id, finish_time in list(self.job_finish_times.items()):
+            if (
+                finish_time > expire_time
+                and len(self.job_finish_times) <= MAX_FINISHED_JOBS
+            ):
+                break
+            del self.job_finish_times[job_id]
+            del self.jobs[job_id]
+
+    def finish_job(self, job_id: str, **job_update) -> None:
+        with self.jobs_lock:
+            self.jobs[job_id].update(job_update)
+            self.job_finish_times[job_id] = time.monotonic()
+            self.prune_jobs()
+
+    def add_job(self, job: dict) -> str:
+        with self.jobs_lock:
+            self.prune_jobs()
+            job_id = uuid.uuid4().hex
+            self.jobs[job_id] = {"id": job_id, "status": "queued"}
+
+        def job_done(result: dict) -> None:
+            self.finish_job(job_id, status="done", result=result)
+
+        def job_failed(e: BaseException) -> None:
+            logging.getLogger("").debug(f"Job {job_id} failed: {e}")
+            self.finish_job(job_id, status="failed", error=str(e))
+
+        self.pool.apply_async(
+            run_job,
+            (job_id, job, self.dryrun, self.options),
+            callback=job_done,
+            error_callback=job_failed,
+        )
+        return job_id
+
+    def get_job(self, job_id: str) -> dict | None:
+        with self.jobs_lock:
+            self.prune_jobs()
+            return dict(self.jobs[job_id]) if job_id in self.jobs else None
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.terminate()
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    server: GenerationServer
+
+    def send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        if self.path != "/jobs":
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            content_length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self.send_json(400, {"error": "A valid Content-Length is required."})
+            return
+        if content_length > MAX_REQUEST_BODY_SIZE:
+            self.send_json(
+                413,
+                {
+                    "error": f"The request body can be at most {MAX_REQUEST_BODY_SIZE} bytes."
+                },
+            )
+            return
+
+        body = self.rfile.read(content_length)
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            self.send_json(400, {"error": "The request body must be UTF-8."})
+            return
+
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                job = json.loads(body)
+            except json.JSONDecodeError as e:
+                self.send_json(400, {"error": f"Invalid JSON: {e}"})
+                return
+            if not isinstance(job, dict) or not isinstance(
+                job.get("setting_string"), str
+            ):
+                self.send_json(400, {"error": 'Expected a "setting_string".'})
+                return
+            job = {"setting_string": job["setting_string"]}
+        else:
+            job = {"config": body}
+
+        self.send_json(202, {"id": self.server.add_job(job)})
+
+    def do_GET(self) -> None:
+        job_id = self.path.removeprefix("/jobs/")
+        job = self.server.get_job(job_id) if job_id != self.path else None
+        if job is None:
+            self.send_json(404, {"error": f"Unknown job: {job_id}"})
+            return
+        self.send_json(200, job)
+
+    def log_message(self, format: str, *args) -> None:
+        logging.getLogger("").debug(f"{self.address_string()} - {format % args}")
+
+
+def serve() -> None:
+    args = get_program_args()
+
+    if not args.dryrun:
+        verify_extract()
+
+    # Load everything before the workers are forked so they all share it
+    load_worker_data()
+
+    with GenerationServer(
+        args.serve,
+        args.server_workers,
+        args.dryrun,
+        GenerationOptions.from_program_args(args),
+    ) as server:
+        print(
+            f"Generation server listening on http://127.0.0.1:{server.server_port} with {max(args.server_workers, 1)} worker(s)"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
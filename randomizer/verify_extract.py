@@ -1,7 +1,7 @@
 import hashlib
 from constants.verificationconstants import *
 from filepathconstants import EXEFS_EXTRACT_PATH, ROMFS_EXTRACT_PATH, SSHD_EXTRACT_PATH
-from gui.dialogs.dialog_header import (
+from util.progress import (
     print_progress_text,
     print_verify_text,
     update_verify_value,
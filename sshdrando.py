@@ -41,7 +41,16 @@ if not args.nogui:
         except Exception as e:
             error(e)
 else:
-    from randomizer.randomize import randomize
+    from randomizer.randomize import generate_stats, randomize, randomize_batch
+    from randomizer.server import serve
 
     if __name__ == "__main__":
-        randomize()
+        # The other modes are only available from the command line
+        if args.serve is not None:
+            serve()
+        elif args.stats:
+            generate_stats()
+        elif args.batch or args.seeds_from:
+            randomize_batch()
+        else:
+            randomize()
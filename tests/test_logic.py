@@ -1,11 +1,22 @@
+from collections import Counter
+import csv
+import http.client
+import json
 import os
 import sys
+import threading
+import time
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from logic.generate import generate
+from logic.fill import fast_fill
+from logic.generate import GenerationOptions, generate
+from logic.hints import get_initial_junk_locations, get_junk_locations
 from logic.config import *
+from logic.location import Location
 from logic.search import all_logic_satisfied
+from logic.spoiler_log import build_spoiler_log_data, render_spoiler_log
+from logic.seed_stats import write_seed_stats
 from logic.world import World
 from filepathconstants import SPOILER_LOGS_PATH
 
@@ -14,6 +25,7 @@ def config_test(
     config_file_name: str | Path,
     assert_all_locations_reachable: bool = True,
     remove_spoiler: bool = True,
+    options: GenerationOptions | None = None,
 ) -> list[World]:
     config_file_name = Path(config_file_name)
 
@@ -22,7 +34,7 @@ def config_test(
 
     config = load_config_from_file(config_test_path, allow_rewrite=False)
     write_config_to_file(config_file_name, config)
-    worlds = generate(config_file_name)
+    worlds = generate(config_file_name, options)
 
     if assert_all_locations_reachable:
         assert all_logic_satisfied(worlds)
@@ -38,6 +50,24 @@ def config_test(
     return worlds
 
 
+# Where every item was placed and where every shuffled entrance leads, for
+# checking that generation options don't change what a seed generates
+def get_seed_layout(worlds: list[World]) -> list[dict[str, str]]:
+    return [
+        {
+            **{
+                location.name: str(location.current_item)
+                for location in world.get_all_item_locations()
+            },
+            **{
+                str(entrance): str(entrance.connected_area)
+                for entrance in world.get_shuffled_entrances()
+            },
+        }
+        for world in worlds
+    ]
+
+
 def test_spoiler_as_config() -> None:
     worlds = config_test("spoiler_as_config.yaml", remove_spoiler=False)
     spoiler_path = f"{SPOILER_LOGS_PATH}/{worlds[0].config.get_hash()} Spoiler Log.txt"
@@ -64,6 +94,144 @@ def test_spoiler_as_config() -> None:
     os.remove(anti_spoiler_path)
 
 
+def test_spoiler_log_json() -> None:
+    worlds = config_test("spoiler_as_config.yaml")
+    spoiler_data = build_spoiler_log_data(worlds)
+    read_back = json.loads(json.dumps(spoiler_data, separators=(",", ":")))
+    assert read_back == spoiler_data
+    assert render_spoiler_log(read_back) == render_spoiler_log(spoiler_data)
+
+
+def test_seed_stats() -> None:
+    config_file_name = Path("seed_stats_config.yaml")
+    config = load_config_from_file(
+        Path("tests") / "test_configs" / "default_empty_config.yaml",
+        allow_rewrite=False,
+    )
+    write_config_to_file(config_file_name, config)
+
+    stats_path = Path("seed_stats_test.csv")
+    os.makedirs(SPOILER_LOGS_PATH, exist_ok=True)
+    spoiler_logs = set(os.listdir(SPOILER_LOGS_PATH))
+    assert write_seed_stats(config_file_name, ["1", "2"], stats_path, 2) == 2
+    with open(stats_path, encoding="utf-8", newline="") as stats_file:
+        rows = list(csv.DictReader(stats_file))
+
+    assert [row["seed"] for row in rows] == ["1", "2"]
+    for row in rows:
+        assert row["success"] == "True"
+        assert int(row["spheres"]) > 0
+    # Statistics runs only write the results file
+    assert set(os.listdir(SPOILER_LOGS_PATH)) == spoiler_logs
+
+    stats_path.unlink()
+    config_file_name.unlink()
+
+
+# Generation shouldn't depend on the arguments of whatever program is running it
+def test_generate_ignores_program_args() -> None:
+    program_args = sys.argv
+    sys.argv = ["sshdrando.py", "--unrecognized-argument"]
+    try:
+        config_test("default_empty_config.yaml")
+    finally:
+        sys.argv = program_args
+
+
+# Jobs with the same seed and settings are generated at the same time
+# and both write the same spoiler logs
+def test_generation_server() -> None:
+    # The server also loads the patching code, which the other tests don't need
+    from randomizer.server import GenerationServer, load_worker_data
+    from randomizer.setting_string import setting_string_from_config
+
+    config = load_config_from_file(
+        Path("tests") / "test_configs" / "default_empty_config.yaml",
+        allow_rewrite=False,
+    )
+    config.seed = "TESTSERVER"
+    load_worker_data()
+    body = json.dumps(
+        {"setting_string": setting_string_from_config(config, None)}
+    ).encode("utf-8")
+
+    def request(method: str, path: str, body: bytes | None = None) -> dict:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+        connection.request(
+            method, path, body, {"Content-Type": "application/json"} if body else {}
+        )
+        response = connection.getresponse()
+        data = json.loads(response.read())
+        connection.close()
+        assert response.status in (200, 202), data
+        return data
+
+    with GenerationServer(0, 2, True, GenerationOptions()) as server:
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            job_ids = [request("POST", "/jobs", body)["id"] for _ in range(2)]
+            assert job_ids[0] != job_ids[1]
+
+            jobs = [request("GET", f"/jobs/{job_id}") for job_id in job_ids]
+            timeout = time.monotonic() + 600
+            while any(job["status"] == "queued" for job in jobs):
+                assert time.monotonic() < timeout
+                time.sleep(1)
+                jobs = [request("GET", f"/jobs/{job_id}") for job_id in job_ids]
+        finally:
+            server.shutdown()
+
+    for job in jobs:
+        assert job["status"] == "done", job.get("error")
+        assert job["result"]["seed"] == "TESTSERVER"
+        assert job["result"]["output_dir"] is None
+    assert jobs[0]["result"] == jobs[1]["result"]
+
+    result = jobs[0]["result"]
+    for log_path in [result["spoiler_log"], result["anti_spoiler_log"]]:
+        if log_path is not None:
+            with open(log_path, encoding="utf-8") as log:
+                assert f"Hash: {result['hash']}" in log.read()
+            os.remove(log_path)
+    assert not any(name.endswith(".tmp") for name in os.listdir(SPOILER_LOGS_PATH))
+
+
+# Junk propagation should match repeatedly checking every potentially
+# junk location until no more locations become junk
+def test_junk_locations() -> None:
+    config_file_name = Path("junk_locations_config.yaml")
+    config = load_config_from_file(
+        Path("tests") / "test_configs" / "all_hints.yaml", allow_rewrite=False
+    )
+    config.seed = "2"
+    write_config_to_file(config_file_name, config)
+    worlds = generate(config_file_name)
+    config_file_name.unlink()
+
+    for world in worlds:
+        junk_locations, potentially_junk_locations = get_initial_junk_locations(world)
+        new_junk_locations = True
+        while new_junk_locations:
+            new_junk_locations = False
+            for location, chain_locations in potentially_junk_locations:
+                if (
+                    location not in junk_locations
+                    and location.current_item.is_major_item
+                    and all(
+                        not chain_location.current_item.is_major_item
+                        or chain_location in junk_locations
+                        for chain_location in chain_locations
+                    )
+                ):
+                    new_junk_locations = True
+                    junk_locations.add(location)
+        assert get_junk_locations(world) == junk_locations
+
+    os.remove(f"{SPOILER_LOGS_PATH}/{worlds[0].config.get_hash()} Spoiler Log.txt")
+    os.remove(f"{SPOILER_LOGS_PATH}/{worlds[0].config.get_hash()} Anti Spoiler Log.txt")
+
+
 def test_default_empty_config() -> None:
     config_test("default_empty_config.yaml")
 
@@ -166,6 +334,24 @@ def test_randomize_overworld_entrances() -> None:
     config_test("randomize_overworld_entrances.yaml")
 
 
+def test_fill_workers() -> None:
+    serial_worlds = config_test("randomize_door_entrances_decoupled.yaml")
+    parallel_worlds = config_test(
+        "randomize_door_entrances_decoupled.yaml",
+        options=GenerationOptions(fill_workers=2),
+    )
+    assert get_seed_layout(parallel_worlds) == get_seed_layout(serial_worlds)
+
+
+def test_entrance_candidate_workers() -> None:
+    serial_worlds = config_test("randomize_door_entrances_decoupled.yaml")
+    parallel_worlds = config_test(
+        "randomize_door_entrances_decoupled.yaml",
+        options=GenerationOptions(entrance_candidate_workers=2),
+    )
+    assert get_seed_layout(parallel_worlds) == get_seed_layout(serial_worlds)
+
+
 def test_decouple_entrances() -> None:
     config_test("decouple_entrances.yaml")
 
@@ -206,6 +392,47 @@ def test_default_multiworld_config() -> None:
     config_test("default_multiworld_config.yaml")
 
 
+# No location should be hinted at by more than one world, whether or not
+# the worlds' hints are generated in parallel
+def test_multiworld_hints() -> None:
+    all_hints = []
+    for hint_workers in [0, 2]:
+        worlds = config_test(
+            "default_multiworld_config.yaml",
+            options=GenerationOptions(hint_workers=hint_workers),
+        )
+        hinting_worlds: dict[Location, World] = {}
+        for world in worlds:
+            hinted_locations = set(world.fi_hints)
+            for locations in world.gossip_stone_hints.values():
+                hinted_locations.update(locations)
+            for location in hinted_locations:
+                assert hinting_worlds.setdefault(location, world) is world
+
+        all_hints.append(
+            [
+                (
+                    [f"{location}: {location.hint}" for location in world.fi_hints],
+                    {
+                        stone.name: [
+                            f"{location}: {location.hint}" for location in locations
+                        ]
+                        for stone, locations in world.gossip_stone_hints.items()
+                    },
+                )
+                for world in worlds
+            ]
+        )
+
+    # The hints shouldn't depend on how many workers generated them
+    assert all_hints[0] == all_hints[1]
+
+
+# Nothing to place shouldn't be an error
+def test_fast_fill_empty_item_pool() -> None:
+    fast_fill(Counter(), [])
+
+
 def test_traps_all() -> None:
     config_test("traps_all.yaml")
 
@@ -26,6 +26,79 @@ def get_program_args():
         help="Skip generating patch files.",
     )
 
+    parser.add_argument(
+        "--fill-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run item fill and entrance shuffle attempts in N worker processes at a time. 0 runs them one by one. Seeds are the same either way.",
+    )
+
+    parser.add_argument(
+        "--entrance-candidate-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Validate N entrance shuffle candidates at a time in worker processes. 0 validates them one by one.",
+    )
+
+    parser.add_argument(
+        "--hint-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Generate the hints for each world in up to N worker processes. 0 generates them one world at a time. Seeds are the same either way.",
+    )
+
+    parser.add_argument(
+        "--spoiler-log-json",
+        action="store_true",
+        help="Also write the spoiler logs as compact JSON next to the text logs.",
+    )
+
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Generate N seeds in a row with the current config. With --seeds-from, only the first N seeds are generated. Requires --nogui.",
+    )
+
+    parser.add_argument(
+        "--seeds-from",
+        metavar="FILE",
+        help="Generate each seed listed in FILE (one per line) with the current config. Requires --nogui.",
+    )
+
+    parser.add_argument(
+        "--stats",
+        metavar="FILE",
+        help="Only generate the seeds given by --batch or --seeds-from and write a summary of each one to FILE as CSV. Nothing is patched and no spoiler logs are written. Requires --nogui.",
+    )
+
+    parser.add_argument(
+        "--stats-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Generate up to N seeds at a time in worker processes with --stats. 0 generates them one by one.",
+    )
+
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help="Run a local generation server on http://127.0.0.1:PORT which generates seeds on request. Requires --nogui.",
+    )
+
+    parser.add_argument(
+        "--server-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Generate up to N seeds at a time with --serve.",
+    )
+
     # parser.print_help()
     args = parser.parse_args()
 
@@ -0,0 +1,93 @@
+from typing import Callable
+import logging
+
+# Progress reporting for randomizing and verifying the extract. Progress text
+# is always logged. A frontend can register callbacks to show the progress
+# itself, e.g. the gui updates its progress dialogs from them. Callbacks may
+# raise ThreadCancelled to cancel whatever is reporting the progress.
+#
+# Nothing outside of the gui should import Qt, so that headless runs never
+# have to load it.
+
+ProgressValueCallback = Callable[[int], None]
+ProgressTextCallback = Callable[[str], None]
+
+
+class ThreadCancelled(Exception):
+    def __str__(self):
+        return "Some QThread was cancelled."
+
+
+class ProgressCallbacks:
+    def __init__(self) -> None:
+        self.value_callback: ProgressValueCallback | None = None
+        self.text_callback: ProgressTextCallback | None = None
+
+    def set(
+        self,
+        value_callback: ProgressValueCallback | None,
+        text_callback: ProgressTextCallback | None,
+    ) -> None:
+        self.value_callback = value_callback
+        self.text_callback = text_callback
+
+    def update_value(self, value: int) -> None:
+        if self.value_callback is not None:
+            self.value_callback(value)
+
+    def update_text(self, label_text: str) -> None:
+        if self.text_callback is not None:
+            self.text_callback(label_text)
+
+
+_randomization_progress = ProgressCallbacks()
+_verification_progress = ProgressCallbacks()
+
+
+def set_progress_callbacks(
+    value_callback: ProgressValueCallback | None = None,
+    text_callback: ProgressTextCallback | None = None,
+) -> None:
+    _randomization_progress.set(value_callback, text_callback)
+
+
+def set_verify_callbacks(
+    value_callback: ProgressValueCallback | None = None,
+    text_callback: ProgressTextCallback | None = None,
+) -> None:
+    _verification_progress.set(value_callback, text_callback)
+
+
+# Whether anything is showing the randomization progress values. Progress
+# values can be skipped when they'd be expensive to calculate otherwise.
+def is_showing_progress() -> bool:
+    return _randomization_progress.value_callback is not None
+
+
+def get_progress_value_from_range(
+    end_value: int, range_size: int, current_step: int, total_steps: int
+) -> int:
+    # final_value - ( ((total_tasks - current_tast)/total_tasks) * value_range_to_fill)
+    progress_left_to_make = total_steps - current_step
+    progress_made_ratio = progress_left_to_make / total_steps
+
+    return int(end_value - (progress_made_ratio * range_size))
+
+
+def update_progress_value(value: int):
+    _randomization_progress.update_value(value)
+
+
+def print_progress_text(label_text: str):
+    _randomization_progress.update_text(label_text)
+    logging.getLogger("").debug(label_text)
+    print(label_text)
+
+
+def update_verify_value(value: int):
+    _verification_progress.update_value(value)
+
+
+def print_verify_text(label_text: str):
+    _verification_progress.update_text(label_text)
+    logging.getLogger("").debug(label_text)
@@ -1,6 +1,6 @@
 from pathlib import Path
 from filepathconstants import TEXT_DATA_PATH
-from gui.dialogs.dialog_header import print_progress_text
+from util.progress import print_progress_text
 from sslib.msb import CONTROL_REPLACEMENTS
 from typing import Union
 import copy